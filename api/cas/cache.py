@@ -5,80 +5,86 @@
 
 from api.cas.cli import *
 from api.cas.casadm_parser import *
+from api.cas.statistics import StatsSnapshot, get_cas_disk_stats, get_statistics_matrix
+from api.cas.flush_monitor import FlushMonitor
+from api.cas.remote_wait import wait_for_dirty_zero
+from api.cas.topology import CacheEntry, CasTopology
 from test_utils.os_utils import *
 from cas_configuration.cache_config import *
 from storage_devices.device import Device
-from test_package.test_properties import TestProperties
 from api.cas.casadm_params import *
 
 
 class Cache:
-    def __init__(self, device_system_path):
+    def __init__(self, device_system_path, cache_id: int = None):
         self.cache_device = Device(device_system_path)
-        self.cache_id = int(self.__get_cache_id())
+        self.cache_id = cache_id if cache_id is not None else self.__get_cache_id()
         self.__cache_line_size = None
         self.__metadata_mode = None
         self.__metadata_size = None
 
     def __get_cache_id(self):
-        cmd = f"{list_cmd()} | grep {self.cache_device.system_path}"
-        output = TestProperties.executor.execute(cmd)
-        if output.exit_code == 0 and output.stdout.strip():
-            return output.stdout.split()[1]
-        else:
+        cache = CasTopology().get_by_device(self.cache_device.system_path)
+        if not isinstance(cache, CacheEntry):
             raise Exception(f"There is no cache started on {self.cache_device.system_path}.")
+        return cache.cache_id
 
     def get_core_devices(self):
         return get_cores(self.cache_id)
 
     def get_cache_line_size(self):
         if self.__cache_line_size is None:
-            stats = self.get_cache_statistics()
-            stats_line_size = stats["cache line size"]
-            self.__cache_line_size = CacheLineSize(stats_line_size.get_value(Unit.Byte))
+            self.__cache_line_size = self.get_statistics_snapshot().get_cache_line_size()
         return self.__cache_line_size
 
     def get_cleaning_policy(self):
-        stats = self.get_cache_statistics()
-        cp = stats["cleaning policy"]
-        return CleaningPolicy[cp]
+        return self.get_statistics_snapshot().get_cleaning_policy()
 
     def get_eviction_policy(self):
-        stats = self.get_cache_statistics()
-        ep = stats["eviction policy"]
-        return EvictionPolicy[ep]
+        return self.get_statistics_snapshot().get_eviction_policy()
 
     def get_metadata_mode(self):
         if self.__metadata_mode is None:
-            stats = self.get_cache_statistics()
-            mm = stats["metadata mode"]
-            self.__metadata_mode = MetadataMode[mm]
+            self.__metadata_mode = self.get_statistics_snapshot().get_metadata_mode()
         return self.__metadata_mode
 
     def get_metadata_size(self):
         if self.__metadata_size is None:
-            stats = self.get_cache_statistics()
-            self.__metadata_size = stats["metadata memory footprint"]
+            self.__metadata_size = self.get_statistics_snapshot().get_metadata_size()
         return self.__metadata_size
 
     def get_occupancy(self):
-        return self.get_cache_statistics()["occupancy"]
+        return self.get_statistics_snapshot().get_occupancy()
 
     def get_status(self):
-        status = self.get_cache_statistics()["status"].replace(' ', '_')
-        return CacheStatus[status]
+        return self.get_statistics_snapshot().get_status()
 
     def get_cache_mode(self):
-        return CacheMode[self.get_cache_statistics()["write policy"].upper()]
+        return self.get_statistics_snapshot().get_cache_mode()
 
     def get_dirty_blocks(self):
-        return self.get_cache_statistics()["dirty"]
+        return self.get_statistics_snapshot().get_dirty_blocks()
 
     def get_dirty_for(self):
-        return self.get_cache_statistics()["dirty for"]
+        return self.get_statistics_snapshot().get_dirty_for()
 
     def get_clean_blocks(self):
-        return self.get_cache_statistics()["clean"]
+        return self.get_statistics_snapshot().get_clean_blocks()
+
+    def get_statistics_snapshot(self, io_class_id: int = None, max_age: timedelta = None):
+        """Use the snapshot to read several statistics with single casadm call."""
+        return StatsSnapshot(self.cache_id, None, io_class_id, max_age)
+
+    def get_statistics_matrix(self, core_ids: list = None, io_class_ids: list = None,
+                              percentage_val: bool = False):
+        return get_statistics_matrix(self.cache_id, core_ids, io_class_ids, percentage_val)
+
+    def get_disk_stats(self, cores: list = None):
+        return get_cas_disk_stats(self.cache_id, self.cache_device.system_path, cores)
+
+    def wait_for_dirty_zero(self, timeout: timedelta,
+                            interval: timedelta = timedelta(seconds=1)):
+        return wait_for_dirty_zero(self.cache_id, timeout, interval=interval)
 
     def get_flush_parameters_alru(self):
         return get_flush_parameters_alru(self.cache_id)
@@ -100,6 +106,10 @@ class Cache:
         sync()
         assert self.get_dirty_blocks().get_value(Unit.Blocks4096) == 0
 
+    def start_flush(self, interval: timedelta = timedelta(seconds=1)):
+        """Starts flushing in background, returns FlushMonitor reporting its progress."""
+        return FlushMonitor(self.cache_id, interval=interval).start()
+
     def stop(self, no_data_flush: bool = False):
         return casadm.stop_cache(self.cache_id, no_data_flush)
 
@@ -32,7 +32,7 @@ def start_cache(cache_dev: Device, cache_mode: CacheMode = None,
     if output.exit_code != 0:
         raise Exception(
             f"Failed to start cache. stdout: {output.stdout} \n stderr :{output.stderr}")
-    return Cache(cache_dev.system_path)
+    return Cache(cache_dev.system_path, cache_id)
 
 
 def stop_cache(cache_id: int, no_data_flush: bool = False, shortcut: bool = False):
@@ -45,14 +45,14 @@ def stop_cache(cache_id: int, no_data_flush: bool = False, shortcut: bool = Fals
 
 
 def add_core(cache: Cache, core_dev: Device, core_id: int = None, shortcut: bool = False):
-    _core_id = None if core_id is None else str(id)
+    _core_id = None if core_id is None else str(core_id)
     output = TestProperties.executor.execute(
         add_core_cmd(cache_id=str(cache.cache_id), core_dev=core_dev.system_path,
                      core_id=_core_id, shortcut=shortcut))
     if output.exit_code != 0:
         raise Exception(
             f"Failed to add core. stdout: {output.stdout} \n stderr :{output.stderr}")
-    return Core(core_dev.system_path, cache.cache_id)
+    return Core(core_dev.system_path, cache.cache_id, core_id)
 
 
 def remove_core(cache_id: int, core_id: int, force: bool = False, shortcut: bool = False):
@@ -4,10 +4,12 @@
 #
 
 from api.cas import casadm
+from test_utils.dut_capabilities import get_capabilities
 from test_utils.size import parse_unit
 from cas_configuration.cache_config import *
 from api.cas.casadm_params import *
 from datetime import timedelta
+from functools import lru_cache
 from typing import List
 from packaging import version
 import re
@@ -50,117 +52,140 @@ def get_statistics(
     filter: List[casadm.StatsFilter] = None,
     percentage_val: bool = False,
 ):
-    stats = {}
+    stats, percentage_stats = get_statistics_values(cache_id, core_id, io_class_id, filter)
+    return percentage_stats if percentage_val else stats
 
-    _filter = get_filter(filter)
 
+def get_statistics_values(
+    cache_id: int,
+    core_id: int = None,
+    io_class_id: int = None,
+    filter: List[casadm.StatsFilter] = None,
+):
+    """Retrieves all requested statistic sections with single casadm call. Returns both
+    absolute and percentage values."""
     per_io_class = True if io_class_id is not None else False
 
-    # No need to retrieve all stats if user specified only 'conf' flag
-    if filter != [StatsFilter.conf]:
-        csv_stats = casadm.print_statistics(
-            cache_id=cache_id,
-            core_id=core_id,
-            per_io_class=per_io_class,
-            io_class_id=io_class_id,
-            filter=_filter,
-            output_format=casadm.OutputFormat.csv,
-        ).stdout.splitlines()
-
-    if filter is None or StatsFilter.conf in filter or StatsFilter.all in filter:
-        # Conf statistics have different unit or may have no unit at all. For parsing
-        # convenience they are gathered separately. As this is only configuration stats
-        # there is no risk they are divergent.
-        conf_stats = casadm.print_statistics(
-            cache_id=cache_id,
-            core_id=core_id,
-            per_io_class=per_io_class,
-            io_class_id=io_class_id,
-            filter=[StatsFilter.conf],
-            output_format=casadm.OutputFormat.csv,
-        ).stdout.splitlines()
-        stat_keys = conf_stats[0]
-        stat_values = conf_stats[1]
-        for (name, val) in zip(stat_keys.split(","), stat_values.split(",")):
-            # Some of configuration stats have no unit
-            try:
-                stat_name, stat_unit = name.split(" [")
-            except ValueError:
-                stat_name = name
-                stat_unit = None
+    # Without filter casadm prints all sections, including conf
+    if filter is not None and StatsFilter.all in filter:
+        filter = None
 
-            stat_name = stat_name.lower()
+    csv_stats = casadm.print_statistics(
+        cache_id=cache_id,
+        core_id=core_id,
+        per_io_class=per_io_class,
+        io_class_id=io_class_id,
+        filter=filter,
+        output_format=casadm.OutputFormat.csv,
+    ).stdout.splitlines()
 
-            # 'dirty for' and 'cache size' stats occurs twice
-            if stat_name in stats:
-                continue
-
-            stat_unit = parse_stats_unit(stat_unit)
-
-            if isinstance(stat_unit, Unit):
-                stats[stat_name] = Size(float(val), stat_unit)
-            elif stat_unit == "s":
-                stats[stat_name] = timedelta(seconds=int(val))
-            elif stat_unit == "":
-                # Some of stats without unit can be a number like IDs,
-                # some of them can be string like device path
-                try:
-                    stats[stat_name] = float(val)
-                except ValueError:
-                    stats[stat_name] = val
-
-    # No need to parse all stats if user specified only 'conf' flag
-    if filter == [StatsFilter.conf]:
-        return stats
-
-    stat_keys = csv_stats[0]
-    stat_values = csv_stats[1]
-    for (name, val) in zip(stat_keys.split(","), stat_values.split(",")):
-        if percentage_val and " [%]" in name:
-            stats[name.split(" [")[0].lower()] = float(val)
-        elif not percentage_val and "[%]" not in name:
-            stat_name, stat_unit = name.split(" [")
-
-            stat_unit = parse_stats_unit(stat_unit)
+    return parse_statistics(csv_stats)
+
+
+def parse_statistics(csv_stats: List[str]):
+    """
+    Parses csv statistics output. Returns two dicts: stats with absolute values and stats with
+    percentage values. Stats which have no percentage value (e.g. conf stats) are in both.
+    """
+    return get_stats_schema(csv_stats[0]).parse(csv_stats[1])
 
+
+@lru_cache(maxsize=64)
+def get_stats_schema(header: str):
+    """Returns schema compiled from csv statistics header. Schemas are cached per header."""
+    return StatsSchema(header)
+
+
+class StatsField:
+    __slots__ = ("index", "name", "unit", "convert")
+
+    def __init__(self, index: int, name: str, unit, convert):
+        self.index = index
+        self.name = name
+        self.unit = unit
+        self.convert = convert
+
+
+class StatsSchema:
+    """
+    Csv statistics header compiled once into fields with precomputed names and value
+    converters, so rows are parsed without splitting or matching the header again.
+    """
+    def __init__(self, header: str):
+        self.value_fields = []
+        self.percentage_fields = []
+        value_names = set()
+        for index, name in enumerate(header.split(",")):
+            # Some of configuration stats have no unit
+            stat_name, _, stat_unit = name.partition(" [")
             stat_name = stat_name.lower()
+            stat_unit = parse_stats_unit(stat_unit or None)
+
+            if stat_unit == "%":
+                self.percentage_fields.append(StatsField(index, stat_name, stat_unit, float))
+            # 'dirty for' and 'cache size' stats occurs twice
+            elif stat_name not in value_names:
+                value_names.add(stat_name)
+                self.value_fields.append(StatsField(index, stat_name, stat_unit,
+                                                    get_stat_converter(stat_unit)))
+        percentage_names = {field.name for field in self.percentage_fields}
+        self.counter_fields = [field for field in self.value_fields
+                               if isinstance(field.unit, Unit) or field.unit == "requests"]
+        self.percentage_only_fields = [field for field in self.value_fields
+                                       if field.name not in percentage_names]
+
+    def parse(self, row: str):
+        values = row.split(",")
+        stats = {field.name: field.convert(values[field.index]) for field in self.value_fields}
+        percentage_stats = {field.name: float(values[field.index])
+                            for field in self.percentage_fields}
+        for field in self.percentage_only_fields:
+            percentage_stats[field.name] = stats[field.name]
+        return stats, percentage_stats
+
+    def parse_counters(self, values: List[str]):
+        """Returns raw integer values of counter fields (blocks and requests)."""
+        return [int(float(values[field.index])) for field in self.counter_fields]
+
+
+def get_stat_converter(stat_unit):
+    if isinstance(stat_unit, Unit):
+        return lambda val: Size(float(val), stat_unit)
+    elif stat_unit == "s":
+        return lambda val: timedelta(seconds=int(val))
+    elif stat_unit == "requests":
+        return float
+    elif stat_unit == "":
+        return parse_stat_value_without_unit
+    else:
+        raise ValueError(f"Invalid unit {stat_unit}")
 
-            if isinstance(stat_unit, Unit):
-                stats[stat_name] = Size(float(val), stat_unit)
-            elif stat_unit == "requests":
-                stats[stat_name] = float(val)
-            else:
-                raise ValueError(f"Invalid unit {stat_unit}")
 
-    return stats
+def parse_stat_value_without_unit(val: str):
+    # Some of stats without unit can be a number like IDs,
+    # some of them can be string like device path
+    try:
+        return float(val)
+    except ValueError:
+        return val
 
 
-def get_caches():  # This method does not return inactive or detached CAS devices
+def get_caches(topology=None):  # This method does not return inactive or detached CAS devices
     from api.cas.cache import Cache
-    caches_list = []
-    lines = casadm.list_caches(OutputFormat.csv).stdout.split('\n')
-    for line in lines:
-        args = line.split(',')
-        if args[0] == "cache":
-            current_cache = Cache(args[2])
-            caches_list.append(current_cache)
-    return caches_list
+    from api.cas.topology import CasTopology
+    topology = topology or CasTopology()
+    return [Cache(cache.path, cache.cache_id) for cache in topology.caches.values()]
 
 
-def get_cores(cache_id: int):
+def get_cores(cache_id: int, topology=None):
     from api.cas.core import Core, CoreStatus
+    from api.cas.topology import CasTopology
+    topology = topology or CasTopology()
     cores_list = []
-    lines = casadm.list_caches(OutputFormat.csv).stdout.split('\n')
-    is_proper_core_line = False
-    for line in lines:
-        args = line.split(',')
-        if args[0] == "core" and is_proper_core_line:
-            core_status_str = args[3].lower()
-            is_valid_status = CoreStatus[core_status_str].value[0] <= 1
-            if is_valid_status:
-                cores_list.append(Core(args[2], cache_id))
-        if args[0] == "cache":
-            is_proper_core_line = True if int(args[1]) == cache_id else False
+    for core in topology.get_cores(cache_id):
+        is_valid_status = CoreStatus[core.status.lower()].value[0] <= 1
+        if is_valid_status:
+            cores_list.append(Core(core.path, cache_id, core.core_id, core.exp_obj))
     return cores_list
 
 
@@ -204,6 +229,7 @@ def get_seq_cut_off_parameters(cache_id: int, core_id: int):
 
 
 def get_casadm_version():
-    casadm_output = casadm.print_version(OutputFormat.csv).stdout.split('\n')
-    version_str = casadm_output[1].split(',')[-1]
+    version_str = get_capabilities().get_casadm_version()
+    if version_str is None:
+        raise Exception("Failed to get casadm version, casadm is not installed.")
     return version.parse(version_str)
@@ -6,6 +6,10 @@ from typing import List
 
 from api.cas.cli import *
 from api.cas.casadm_parser import *
+from api.cas.statistics import StatsSnapshot
+from api.cas.flush_monitor import FlushMonitor
+from api.cas.remote_wait import wait_for_core_status, wait_for_dirty_zero
+from api.cas.topology import CasTopology
 from api.cas.cache import Device
 from test_utils.os_utils import *
 
@@ -18,50 +22,84 @@ class CoreStatus(Enum):
 
 
 class Core(Device):
-    def __init__(self, core_device: str, cache_id: int):
+    def __init__(self, core_device: str, cache_id: int, core_id: int = None,
+                 exp_obj: str = None):
         self.core_device = Device(core_device)
-        self.system_path = None
-        core_info = self.__get_core_info()
-        self.core_id = int(core_info["core_id"])
-        Device.__init__(self, core_info["exp_obj"])
         self.cache_id = cache_id
+        self.__core_id = core_id
+        self.__exp_obj = None
+        Device.__init__(self, exp_obj)
+
+    # Core id and exported object are looked up in casadm list only when used
+    @property
+    def core_id(self):
+        if self.__core_id is None:
+            self.__load_core_info()
+        return self.__core_id
+
+    @property
+    def system_path(self):
+        if self.__exp_obj is None:
+            self.__load_core_info()
+        return self.__exp_obj
+
+    @system_path.setter
+    def system_path(self, value):
+        self.__exp_obj = value
+
+    def invalidate(self):
+        Device.invalidate(self)
+        self.core_device.invalidate()
+        self.__core_id = None
+        self.__exp_obj = None
+
+    def __load_core_info(self):
+        core = self.__get_core_info()
+        self.__core_id, self.__exp_obj = core.core_id, core.exp_obj
 
     def __get_core_info(self):
-        output = TestProperties.executor.execute(
-            list_cmd(OutputFormat.csv.name))
-        if output.exit_code != 0:
-            raise Exception("Failed to execute list caches command.")
-        output_lines = output.stdout.splitlines()
-        for line in output_lines:
-            split_line = line.split(',')
-            if split_line[0] == "core" and (split_line[2] == self.core_device.system_path
-                                            or split_line[5] == self.system_path):
-                return {"core_id": split_line[1],
-                        "core_device": split_line[2],
-                        "status": split_line[3],
-                        "exp_obj": split_line[5]}
+        topology = CasTopology()
+        if self.__exp_obj is not None:
+            core = topology.get_by_exported_object(self.__exp_obj)
+        else:
+            core = topology.get_by_device(self.core_device.system_path)
+        if core is None or core.cache_id != int(self.cache_id):
+            raise Exception(f"There is no core {self.core_device.system_path} "
+                            f"in cache {self.cache_id}.")
+        return core
 
     def get_core_statistics(self,
                             io_class_id: int = None,
                             stat_filter: List[StatsFilter] = None,
                             percentage_val: bool = False):
         return get_statistics(self.cache_id, self.core_id, io_class_id,
-                                            stat_filter, percentage_val)
+                              stat_filter, percentage_val)
 
     def get_status(self):
-        return self.__get_core_info()["status"]
+        return self.__get_core_info().status
+
+    def wait_for_status(self, status: CoreStatus, timeout: timedelta,
+                        interval: timedelta = timedelta(milliseconds=500)):
+        return wait_for_core_status(self.cache_id, self.core_id, status, timeout, interval)
+
+    def wait_for_dirty_zero(self, timeout: timedelta,
+                            interval: timedelta = timedelta(seconds=1)):
+        return wait_for_dirty_zero(self.cache_id, timeout, self.core_id, interval)
 
     def get_seq_cut_off_parameters(self):
         return get_seq_cut_off_parameters(self.cache_id, self.core_id)
 
     def get_dirty_blocks(self):
-        return self.get_core_statistics()["dirty"]
+        return self.get_statistics_snapshot().get_dirty_blocks()
 
     def get_clean_blocks(self):
-        return self.get_core_statistics()["clean"]
+        return self.get_statistics_snapshot().get_clean_blocks()
 
     def get_occupancy(self):
-        return self.get_core_statistics()["occupancy"]
+        return self.get_statistics_snapshot().get_occupancy()
+
+    def get_statistics_snapshot(self, io_class_id: int = None, max_age: timedelta = None):
+        return StatsSnapshot(self.cache_id, self.core_id, io_class_id, max_age)
 
     # Casadm methods:
 
@@ -76,6 +114,9 @@ class Core(Device):
         sync()
         assert self.get_dirty_blocks().get_value(Unit.Blocks4096) == 0
 
+    def start_flush(self, interval: timedelta = timedelta(seconds=1)):
+        return FlushMonitor(self.cache_id, self.core_id, interval).start()
+
     def set_seq_cutoff_parameters(self, seq_cutoff_param: SeqCutOffParameters):
         casadm.set_param_cutoff(self.cache_id, self.core_id,
                                 seq_cutoff_param.threshold, seq_cutoff_param.policy)
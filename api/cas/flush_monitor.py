@@ -0,0 +1,103 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+from datetime import timedelta
+
+from api.cas.cli import flush_cache_cmd, flush_core_cmd
+from api.cas.stats_sampler import StatsSampler
+from test_package.test_properties import TestProperties
+from test_utils.size import Size, Unit
+
+
+class FlushMonitor:
+    """
+    Flush of a cache or core running in background, with its dirty counter sampled on the DUT
+    by StatsSampler. Progress can be checked while flushing; samples stay available after
+    flush ends, e.g. to compare cleaning policies.
+    """
+    def __init__(self, cache_id: int, core_id: int = None,
+                 interval: timedelta = timedelta(seconds=1)):
+        self.cache_id = cache_id
+        self.core_id = core_id
+        self.sampler = StatsSampler(cache_id, [] if core_id is None else [core_id],
+                                    interval=interval)
+        self.target = "cache" if core_id is None else f"core{core_id}"
+        self.job = None
+
+    def start(self):
+        # Sampler goes first, so the initial dirty count is captured
+        self.sampler.start()
+        if self.core_id is None:
+            command = flush_cache_cmd(cache_id=str(self.cache_id))
+        else:
+            command = flush_core_cmd(cache_id=str(self.cache_id), core_id=str(self.core_id))
+        TestProperties.LOGGER.info(command)
+        self.job = TestProperties.executor.start_background_job(command)
+        return self
+
+    def is_running(self):
+        return self.job.is_running()
+
+    def wait(self, timeout: timedelta = None):
+        """Waits for the flush to finish and stops sampling. Raises if flush failed."""
+        exit_code = self.job.wait(timeout)
+        if exit_code is None:
+            return None
+        self.sampler.stop()
+        if exit_code != 0:
+            output = self.job.get_output()
+            raise Exception(f"Flushing failed. "
+                            f"stdout: {output.stdout} \n stderr :{output.stderr}")
+        return exit_code
+
+    def get_samples(self):
+        """Returns SampleSeries of the flushed cache or core, fetching new samples first."""
+        if self.job.poll() is None:
+            self.sampler.fetch()
+        return self.sampler.series.get(self.target)
+
+    def get_dirty(self):
+        samples = self.get_samples()
+        if not samples:
+            return None
+        return Size(samples.columns["dirty"][-1], Unit.Blocks4096)
+
+    def get_throughput(self):
+        """Returns average flush throughput in MiB/s."""
+        samples = self.get_samples()
+        if samples is None or len(samples) < 2:
+            return 0.0
+        end = self.__get_end_index(samples)
+        dirty = samples.columns["dirty"]
+        elapsed = samples.timestamps[end] - samples.timestamps[0]
+        if elapsed <= 0:
+            return 0.0
+        flushed = Size(dirty[0] - dirty[end], Unit.Blocks4096)
+        return flushed.get_value(Unit.MebiByte) / elapsed
+
+    def get_eta(self):
+        """Returns estimated time left to the end of flush or None if it cannot be estimated."""
+        throughput = self.get_throughput()
+        dirty = self.get_dirty()
+        if dirty is None or throughput <= 0:
+            return None
+        return timedelta(seconds=dirty.get_value(Unit.MebiByte) / throughput)
+
+    def get_duration(self):
+        """Returns time from the first sample to the first sample with no dirty data."""
+        samples = self.get_samples()
+        if not samples:
+            return timedelta(0)
+        end = self.__get_end_index(samples)
+        return timedelta(seconds=samples.timestamps[end] - samples.timestamps[0])
+
+    def remove_samples(self):
+        self.sampler.remove_samples()
+        self.job.remove_output()
+
+    @staticmethod
+    def __get_end_index(samples):
+        dirty = samples.columns["dirty"]
+        return next((i for i, value in enumerate(dirty) if value == 0), len(dirty) - 1)
@@ -4,6 +4,7 @@
 #
 
 from api.cas import casadm_parser
+from api.cas.topology import CasTopology
 from cas_configuration.cache_config import CacheMode
 from storage_devices.device import Device
 from test_tools import fs_utils
@@ -13,16 +14,21 @@ from config.configuration import cas_init_config_path
 def create_init_config_from_running_configuration(load: bool = None, extra_flags=""):
     cache_lines = []
     core_lines = []
-    for cache in casadm_parser.get_caches():
+    topology = CasTopology()
+    for cache in topology.caches.values():
         cache_lines.append(CacheConfigLine(cache.cache_id,
-                                           cache.cache_device,
+                                           Device(cache.path),
                                            cache.get_cache_mode(),
                                            load,
                                            extra_flags))
-        for core in casadm_parser.get_cores(cache.cache_id):
+        for core in casadm_parser.get_cores(cache.cache_id, topology):
             core_lines.append(CoreConfigLine(cache.cache_id,
                                              core.core_id,
                                              core.core_device))
+    create_init_config(cache_lines, core_lines)
+
+
+def create_init_config(cache_lines: list, core_lines: list):
     config_lines = []
     create_default_init_config()
     if len(cache_lines) > 0:
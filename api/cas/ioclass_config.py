@@ -3,33 +3,156 @@
 # SPDX-License-Identifier: BSD-3-Clause-Clear
 #
 
+from api.cas import casadm
 from test_package.test_properties import TestProperties
+from test_tools import fs_utils
 
 default_config_file_path = "/tmp/opencas_ioclass.conf"
+config_header = "IO class id,IO class name,Eviction priority,Allocation"
+
+MAX_IO_CLASS_ID = 32
+MAX_IO_CLASS_PRIORITY = 255
+MAX_IO_CLASS_NAME_LENGTH = 1024
+DEFAULT_IO_CLASS_ID = 0
+
+
+class IoClass:
+    def __init__(self, ioclass_id: int, rule: str, eviction_priority: int, allocation: bool,
+                 validate: bool = True):
+        self.id = ioclass_id
+        self.rule = rule
+        self.priority = eviction_priority
+        self.allocation = allocation
+        if validate:
+            self.validate()
+
+    def __str__(self):
+        return f"{self.id},{self.rule},{self.priority},{int(self.allocation)}"
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def validate(self):
+        if not 0 <= self.id <= MAX_IO_CLASS_ID:
+            raise ValueError(f"IO class id {self.id} is out of range 0-{MAX_IO_CLASS_ID}.")
+        if not 0 <= self.priority <= MAX_IO_CLASS_PRIORITY:
+            raise ValueError(f"Eviction priority {self.priority} "
+                             f"is out of range 0-{MAX_IO_CLASS_PRIORITY}.")
+        if not self.rule or "," in self.rule or "\n" in self.rule:
+            raise ValueError(f"Invalid IO class rule '{self.rule}'.")
+        if len(self.rule) > MAX_IO_CLASS_NAME_LENGTH:
+            raise ValueError(f"IO class rule is longer than {MAX_IO_CLASS_NAME_LENGTH} characters.")
+
+    @staticmethod
+    def from_line(line: str, validate: bool = True):
+        ioclass_id, rule, eviction_priority, allocation = line.split(",")
+        return IoClass(int(ioclass_id), rule, int(eviction_priority), bool(int(allocation)),
+                       validate)
+
+
+class IoClassConfig:
+    """
+    IO class configuration kept in memory. Rules are validated when added (unless
+    validate=False, e.g. to test rejection of invalid configs) and the whole file is written
+    to the DUT in one transfer by save() or apply().
+    """
+    def __init__(self, add_default_rule: bool = True):
+        self.ioclasses = {}
+        if add_default_rule:
+            self.add(DEFAULT_IO_CLASS_ID, "unclassified", 22, True)
+
+    def __len__(self):
+        return len(self.ioclasses)
+
+    def __iter__(self):
+        return iter(sorted(self.ioclasses.values(), key=lambda ioclass: ioclass.id))
+
+    def __str__(self):
+        return "\n".join([config_header] + [str(ioclass) for ioclass in self])
+
+    def add(self, ioclass_id: int, rule: str, eviction_priority: int, allocation: bool,
+            validate: bool = True):
+        if ioclass_id in self.ioclasses:
+            raise ValueError(f"IO class {ioclass_id} is already defined.")
+        self.ioclasses[ioclass_id] = IoClass(ioclass_id, rule, eviction_priority, allocation,
+                                             validate)
+        return self.ioclasses[ioclass_id]
+
+    def add_rules(self, conditions, eviction_priority: int, allocation: bool,
+                  first_id: int = 1, last_id: int = MAX_IO_CLASS_ID):
+        """
+        Packs conditions (e.g. from generators below) into IO classes with consecutive free
+        ids, joining them with '|' up to maximal rule length. Returns added IO classes.
+        """
+        rules = []
+        for condition in conditions:
+            if rules and len(rules[-1]) + len(condition) + 1 <= MAX_IO_CLASS_NAME_LENGTH:
+                rules[-1] = f"{rules[-1]}|{condition}"
+            else:
+                rules.append(condition)
+        free_ids = [i for i in range(first_id, last_id + 1) if i not in self.ioclasses]
+        if len(rules) > len(free_ids):
+            raise ValueError(f"Conditions need {len(rules)} IO classes, "
+                             f"only {len(free_ids)} ids are free.")
+        return [self.add(ioclass_id, rule, eviction_priority, allocation)
+                for ioclass_id, rule in zip(free_ids, rules)]
+
+    def remove(self, ioclass_id: int):
+        if ioclass_id not in self.ioclasses:
+            raise ValueError(f"IO class {ioclass_id} is not defined.")
+        return self.ioclasses.pop(ioclass_id)
+
+    def get(self, ioclass_id: int):
+        return self.ioclasses.get(ioclass_id)
+
+    def save(self, ioclass_config_path: str = default_config_file_path):
+        TestProperties.LOGGER.info(
+            f"Saving {len(self)} IO classes to config file {ioclass_config_path}"
+        )
+        fs_utils.write_file(ioclass_config_path, str(self))
+
+    def apply(self, cache_id: int, ioclass_config_path: str = default_config_file_path):
+        self.save(ioclass_config_path)
+        return casadm.load_io_classes(cache_id, file=ioclass_config_path)
+
+    @staticmethod
+    def load(ioclass_config_path: str = default_config_file_path, validate: bool = True):
+        config = IoClassConfig(add_default_rule=False)
+        for line in fs_utils.read_file(ioclass_config_path).splitlines()[1:]:
+            if line.strip():
+                ioclass = IoClass.from_line(line, validate)
+                config.add(ioclass.id, ioclass.rule, ioclass.priority, ioclass.allocation,
+                           validate)
+        return config
+
+
+def lba_range_rules(count: int, start: int = 0, length: int = 2048):
+    """Conditions matching consecutive, non-overlapping lba ranges of given length."""
+    for i in range(count):
+        first = start + i * length
+        yield f"lba:ge:{first}&lba:lt:{first + length}"
+
+
+def extension_rules(count: int, prefix: str = "ext"):
+    for i in range(count):
+        yield f"extension:{prefix}{i}"
+
+
+def directory_rules(count: int, parent: str = "/mnt/cas"):
+    for i in range(count):
+        yield f"directory:{parent}/dir{i}"
+
+
+def pid_rules(pids):
+    for pid in pids:
+        yield f"pid:eq:{pid}"
 
 
 def create_ioclass_config(
     add_default_rule: bool = True, ioclass_config_path: str = default_config_file_path
 ):
     TestProperties.LOGGER.info(f"Creating config file {ioclass_config_path}")
-    output = TestProperties.executor.execute(
-        'echo "IO class id,IO class name,Eviction priority,Allocation" '
-        + f"> {ioclass_config_path}"
-    )
-    if output.exit_code != 0:
-        raise Exception(
-            "Failed to create ioclass config file. "
-            + f"stdout: {output.stdout} \n stderr :{output.stderr}"
-        )
-    if add_default_rule:
-        output = TestProperties.executor.execute(
-            f'echo "0,unclassified,22,1" >> {ioclass_config_path}'
-        )
-        if output.exit_code != 0:
-            raise Exception(
-                "Failed to create ioclass config file. "
-                + f"stdout: {output.stdout} \n stderr :{output.stderr}"
-            )
+    IoClassConfig(add_default_rule).save(ioclass_config_path)
 
 
 def remove_ioclass_config(ioclass_config_path: str = default_config_file_path):
@@ -48,8 +171,10 @@ def add_ioclass(
     eviction_priority: int,
     allocation: bool,
     ioclass_config_path: str = default_config_file_path,
+    validate: bool = False,
 ):
-    new_ioclass = f"{ioclass_id},{rule},{eviction_priority},{int(allocation)}"
+    # Not validated by default, so tests can write configs which CAS should reject
+    new_ioclass = str(IoClass(ioclass_id, rule, eviction_priority, allocation, validate))
     TestProperties.LOGGER.info(
         f"Adding rule {new_ioclass} " + f"to config file {ioclass_config_path}"
     )
@@ -68,17 +193,11 @@ def get_ioclass(ioclass_id: int, ioclass_config_path: str = default_config_file_
     TestProperties.LOGGER.info(
         f"Retrieving rule no.{ioclass_id} " + f"from config file {ioclass_config_path}"
     )
-    output = TestProperties.executor.execute(f"cat {ioclass_config_path}")
-    if output.exit_code != 0:
-        raise Exception(
-            "Failed to read ioclass config file. "
-            + f"stdout: {output.stdout} \n stderr :{output.stderr}"
-        )
-
-    ioclass_config = output.stdout.splitlines()
+    # Lines are matched by id only, so config with invalid rules can be read as well
+    ioclass_config = fs_utils.read_file(ioclass_config_path).splitlines()
 
-    for ioclass in ioclass_config:
-        if int(ioclass.split(",")[0]) == ioclass_id:
+    for ioclass in ioclass_config[1:]:
+        if ioclass.split(",")[0].strip() == str(ioclass_id):
             return ioclass
 
 
@@ -88,35 +207,16 @@ def remove_ioclass(
     TestProperties.LOGGER.info(
         f"Removing rule no.{ioclass_id} " + f"from config file {ioclass_config_path}"
     )
-    output = TestProperties.executor.execute(f"cat {ioclass_config_path}")
-    if output.exit_code != 0:
-        raise Exception(
-            "Failed to read ioclass config file. "
-            + f"stdout: {output.stdout} \n stderr :{output.stderr}"
-        )
+    old_ioclass_config = fs_utils.read_file(ioclass_config_path).splitlines()
 
-    old_ioclass_config = output.stdout.splitlines()
-    config_header = old_ioclass_config[0]
-
-    # First line in valid config file is always a header, not a rule - it is
-    # already extracted above
-    new_ioclass_config = [
-        x for x in old_ioclass_config[1:] if int(x.split(",")[0]) != ioclass_id
+    # First line in valid config file is always a header, not a rule
+    new_ioclass_config = [old_ioclass_config[0]] + [
+        x for x in old_ioclass_config[1:] if x.split(",")[0].strip() != str(ioclass_id)
     ]
 
-    new_ioclass_config.insert(0, config_header)
-
     if len(new_ioclass_config) == len(old_ioclass_config):
         raise Exception(
             f"Failed to remove ioclass {ioclass_id} from config file {ioclass_config_path}"
         )
 
-    new_ioclass_config_str = "\n".join(new_ioclass_config)
-    output = TestProperties.executor.execute(
-        f'echo "{new_ioclass_config_str}" > {ioclass_config_path}'
-    )
-    if output.exit_code != 0:
-        raise Exception(
-            "Failed to save new ioclass config. "
-            + f"stdout: {output.stdout} \n stderr :{output.stderr}"
-        )
+    fs_utils.write_file(ioclass_config_path, "\n".join(new_ioclass_config))
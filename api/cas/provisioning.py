@@ -0,0 +1,83 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+from api.cas import casctl, init_config
+from api.cas.cli import add_core_cmd, start_cmd
+from api.cas.topology import CasTopology
+from cas_configuration.cache_config import CacheLineSize, CacheMode
+from storage_devices.device import Device
+from test_package.test_properties import TestProperties
+
+
+class CacheSpec:
+    """Desired cache with its cores. Core ids are assigned in order of core_devices from 1."""
+    def __init__(self, cache_device: Device, core_devices: list = None, cache_id: int = None,
+                 cache_mode: CacheMode = None, cache_line_size: CacheLineSize = None):
+        self.cache_device = cache_device
+        self.core_devices = core_devices or []
+        self.cache_id = cache_id
+        self.cache_mode = cache_mode
+        self.cache_line_size = cache_line_size
+
+
+def provision(cache_specs: list, use_casctl: bool = False, force: bool = False):
+    """
+    Starts all caches and adds all cores described by cache_specs and returns the resulting
+    CasTopology. Caches without cache_id get consecutive free ids, so no command depends on
+    output of another and all of them are applied in one round trip: as one batch of casadm
+    commands or, with use_casctl, as opencas.conf applied by 'casctl init'. Ids of caches
+    already running are not assigned.
+    """
+    used_ids = {spec.cache_id for spec in cache_specs if spec.cache_id is not None}
+    if len(used_ids) < len(cache_specs):
+        used_ids.update(CasTopology().caches.keys())
+    free_ids = (i for i in range(1, 16385) if i not in used_ids)
+    cache_ids = [spec.cache_id if spec.cache_id is not None else next(free_ids)
+                 for spec in cache_specs]
+
+    if use_casctl:
+        _provision_with_casctl(cache_specs, cache_ids, force)
+    else:
+        _provision_with_casadm(cache_specs, cache_ids, force)
+    return CasTopology()
+
+
+def _provision_with_casadm(cache_specs: list, cache_ids: list, force: bool):
+    commands = []
+    for spec, cache_id in zip(cache_specs, cache_ids):
+        commands.append(start_cmd(
+            cache_dev=spec.cache_device.system_path,
+            cache_mode=None if spec.cache_mode is None else spec.cache_mode.name.lower(),
+            cache_line_size=None if spec.cache_line_size is None else
+            str(int(spec.cache_line_size) // 1024),
+            cache_id=str(cache_id), force=force))
+        commands.extend(add_core_cmd(cache_id=str(cache_id), core_dev=core_device.system_path,
+                                     core_id=str(core_id))
+                        for core_id, core_device in enumerate(spec.core_devices, start=1))
+
+    outputs = TestProperties.executor.execute_batch(commands, stop_on_failure=True)
+    failed = outputs[-1] if outputs else None
+    if failed is not None and failed.exit_code != 0:
+        raise Exception(f"Provisioning failed at '{commands[len(outputs) - 1]}'. "
+                        f"stdout: {failed.stdout} \n stderr :{failed.stderr}")
+
+
+def _provision_with_casctl(cache_specs: list, cache_ids: list, force: bool):
+    cache_lines = []
+    core_lines = []
+    for spec, cache_id in zip(cache_specs, cache_ids):
+        extra_flags = "" if spec.cache_line_size is None else \
+            f"cache_line_size={int(spec.cache_line_size) // 1024}"
+        cache_lines.append(init_config.CacheConfigLine(cache_id, spec.cache_device,
+                                                       spec.cache_mode or CacheMode.DEFAULT,
+                                                       extra_flags=extra_flags))
+        core_lines.extend(init_config.CoreConfigLine(cache_id, core_id, core_device)
+                          for core_id, core_device in enumerate(spec.core_devices, start=1))
+    init_config.create_init_config(cache_lines, core_lines)
+
+    output = casctl.init(force)
+    if output.exit_code != 0:
+        raise Exception(f"Provisioning with casctl init failed. "
+                        f"stdout: {output.stdout} \n stderr :{output.stderr}")
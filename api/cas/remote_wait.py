@@ -0,0 +1,53 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import shlex
+from datetime import timedelta
+
+from api.cas.casadm_params import OutputFormat, StatsFilter
+from api.cas.cli import list_cmd, print_statistics_cmd
+from test_utils.remote_wait import wait_for_command
+
+
+def wait_for_dirty_zero(cache_id: int, timeout: timedelta, core_id: int = None,
+                        interval: timedelta = timedelta(seconds=1)):
+    """Waits until cache (or core) has no dirty data. Result value is the last dirty count."""
+    stats_cmd = print_statistics_cmd(cache_id=str(cache_id),
+                                     core_id=None if core_id is None else str(core_id),
+                                     filter=StatsFilter.usage.name,
+                                     output_format=OutputFormat.csv.name)
+    # Dirty column is found by its name, so the check does not depend on column order
+    awk_script = "NR == 1 { for (i = 1; i <= NF; i++) " \
+                 "if (tolower($i) == \"dirty [4kib blocks]\") column = i } " \
+                 "NR == 2 && column { found = 1; print $column; exit ($column != 0) } " \
+                 "END { if (!found) exit 1 }"
+    return wait_for_command(f"{stats_cmd} | awk -F, {shlex.quote(awk_script)}",
+                            timeout, interval)
+
+
+def wait_for_core_status(cache_id: int, core_id: int, status, timeout: timedelta,
+                         interval: timedelta = timedelta(milliseconds=500)):
+    """Waits until core has given CoreStatus. Result value is the last core status."""
+    awk_script = "$1 == \"cache\" { cache = $2 } " \
+                 "$1 == \"core\" && cache == cache_id && $2 == core_id { " \
+                 "found = 1; status = tolower($4); print status; exit (status != expected) } " \
+                 "END { if (!found) exit 1 }"
+    return wait_for_command(f"{list_cmd(OutputFormat.csv.name)} | awk -F, "
+                            f"-v cache_id={cache_id} -v core_id={core_id} "
+                            f"-v expected={status.name} {shlex.quote(awk_script)}",
+                            timeout, interval)
+
+
+def wait_for_cache_status(cache_id: int, status, timeout: timedelta,
+                          interval: timedelta = timedelta(milliseconds=500)):
+    """Waits until cache has given CacheStatus. Result value is the last cache status."""
+    awk_script = "$1 == \"cache\" && $2 == cache_id { " \
+                 "found = 1; status = tolower($4); gsub(\" \", \"_\", status); print status; " \
+                 "exit (status != expected) } " \
+                 "END { if (!found) exit 1 }"
+    return wait_for_command(f"{list_cmd(OutputFormat.csv.name)} | awk -F, "
+                            f"-v cache_id={cache_id} -v expected={status.name} "
+                            f"{shlex.quote(awk_script)}",
+                            timeout, interval)
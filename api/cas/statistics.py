@@ -0,0 +1,239 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import time
+from array import array
+from datetime import timedelta
+
+from api.cas.casadm_params import OutputFormat, StatsFilter
+from api.cas import casadm_parser
+from api.cas.cli import list_cmd, list_io_classes_cmd, print_statistics_cmd
+from api.cas.topology import CasTopology
+from cas_configuration.cache_config import CacheLineSize, CacheMode, CacheStatus, \
+    CleaningPolicy, EvictionPolicy, MetadataMode
+from test_package.test_properties import TestProperties
+from test_tools.disk_stats import DiskStats, get_disk_stats
+from test_utils.size import Unit
+
+
+class StatsSnapshot:
+    """
+    All statistics of a cache, core or IO class retrieved with single casadm call. Getters
+    are answered from memory. Snapshot is retrieved again on refresh() or, if max_age is set,
+    on access when it is older than max_age (timedelta(0) refreshes on every access).
+    """
+    def __init__(self, cache_id: int, core_id: int = None, io_class_id: int = None,
+                 max_age: timedelta = None):
+        self.cache_id = cache_id
+        self.core_id = core_id
+        self.io_class_id = io_class_id
+        self.max_age = max_age
+        self.__stats = None
+        self.__percentage_stats = None
+        self.__timestamp = None
+
+    def refresh(self):
+        self.__stats, self.__percentage_stats = casadm_parser.get_statistics_values(
+            self.cache_id, self.core_id, self.io_class_id)
+        self.__timestamp = time.monotonic()
+        return self
+
+    def get_age(self):
+        if self.__timestamp is None:
+            return None
+        return timedelta(seconds=time.monotonic() - self.__timestamp)
+
+    @property
+    def stats(self):
+        self.__refresh_if_needed()
+        return self.__stats
+
+    @property
+    def percentage_stats(self):
+        self.__refresh_if_needed()
+        return self.__percentage_stats
+
+    def get(self, stat_name: str, percentage_val: bool = False):
+        return (self.percentage_stats if percentage_val else self.stats)[stat_name]
+
+    def get_occupancy(self):
+        return self.stats["occupancy"]
+
+    def get_dirty_blocks(self):
+        return self.stats["dirty"]
+
+    def get_clean_blocks(self):
+        return self.stats["clean"]
+
+    def get_dirty_for(self):
+        return self.stats["dirty for"]
+
+    def get_status(self):
+        return CacheStatus[self.stats["status"].replace(' ', '_')]
+
+    def get_cache_mode(self):
+        return CacheMode[self.stats["write policy"].upper()]
+
+    def get_cleaning_policy(self):
+        return CleaningPolicy[self.stats["cleaning policy"]]
+
+    def get_eviction_policy(self):
+        return EvictionPolicy[self.stats["eviction policy"]]
+
+    def get_cache_line_size(self):
+        return CacheLineSize(self.stats["cache line size"].get_value(Unit.Byte))
+
+    def get_metadata_mode(self):
+        return MetadataMode[self.stats["metadata mode"]]
+
+    def get_metadata_size(self):
+        return self.stats["metadata memory footprint"]
+
+    def __refresh_if_needed(self):
+        if self.__timestamp is None or \
+                (self.max_age is not None and self.get_age() >= self.max_age):
+            self.refresh()
+
+
+class StatsMatrix:
+    """
+    Dense core x IO class x counter matrix of statistics. Values are raw numbers printed by
+    casadm (4KiB blocks, requests or percents) stored in a flat array of doubles; use
+    core_index, io_class_index and counter_index to address them.
+    """
+    def __init__(self, core_ids: list, io_class_ids: list, counters: list, units: list):
+        self.core_ids = core_ids
+        self.io_class_ids = io_class_ids
+        self.counters = counters
+        self.units = units
+        self.core_index = {core_id: i for i, core_id in enumerate(core_ids)}
+        self.io_class_index = {io_class_id: i for i, io_class_id in enumerate(io_class_ids)}
+        self.counter_index = {counter: i for i, counter in enumerate(counters)}
+        self.values = array('d', bytes(8 * len(core_ids) * len(io_class_ids) * len(counters)))
+
+    def get(self, core_id: int, io_class_id: int, counter: str):
+        return self.values[self.__offset(core_id, io_class_id) + self.counter_index[counter]]
+
+    def get_vector(self, core_id: int, io_class_id: int):
+        """Returns all counters of given core and IO class, ordered as self.counters."""
+        offset = self.__offset(core_id, io_class_id)
+        return self.values[offset:offset + len(self.counters)]
+
+    def set_vector(self, core_id: int, io_class_id: int, values):
+        offset = self.__offset(core_id, io_class_id)
+        self.values[offset:offset + len(self.counters)] = array('d', values)
+
+    def sum(self, counter: str, core_id: int = None, io_class_id: int = None):
+        """Sums counter over all cores and/or IO classes which are not specified."""
+        core_ids = self.core_ids if core_id is None else [core_id]
+        io_class_ids = self.io_class_ids if io_class_id is None else [io_class_id]
+        counter_offset = self.counter_index[counter]
+        return sum(self.values[self.__offset(core, io_class) + counter_offset]
+                   for core in core_ids for io_class in io_class_ids)
+
+    def sum_by_core(self, counter: str):
+        return {core_id: self.sum(counter, core_id=core_id) for core_id in self.core_ids}
+
+    def sum_by_io_class(self, counter: str):
+        return {io_class_id: self.sum(counter, io_class_id=io_class_id)
+                for io_class_id in self.io_class_ids}
+
+    def __offset(self, core_id: int, io_class_id: int):
+        return (self.core_index[core_id] * len(self.io_class_ids)
+                + self.io_class_index[io_class_id]) * len(self.counters)
+
+
+def get_statistics_matrix(cache_id: int, core_ids: list = None, io_class_ids: list = None,
+                          percentage_val: bool = False):
+    """
+    Retrieves usage, request and block statistics of every core x IO class pair of a cache.
+    Cores and IO classes not given are listed first; all statistics are then retrieved in
+    one batch, so at most two round trips are made regardless of matrix size.
+    """
+    executor = TestProperties.executor
+    if core_ids is None or io_class_ids is None:
+        lists = executor.execute_batch([list_cmd(OutputFormat.csv.name),
+                                        list_io_classes_cmd(str(cache_id), OutputFormat.csv.name)])
+        for output in lists:
+            if output.exit_code != 0:
+                raise Exception(f"Failed to list cores and IO classes of cache {cache_id}. "
+                                f"stdout: {output.stdout} \n stderr :{output.stderr}")
+        if core_ids is None:
+            core_ids = [core.core_id for core in CasTopology(lists[0].stdout).get_cores(cache_id)]
+        if io_class_ids is None:
+            io_class_ids = [int(line.split(',')[0]) for line in lists[1].stdout.splitlines()[1:]]
+
+    stats_filter = ",".join(f.name for f in [StatsFilter.usage, StatsFilter.req, StatsFilter.blk])
+    pairs = [(core_id, io_class_id) for core_id in core_ids for io_class_id in io_class_ids]
+    outputs = executor.execute_batch(
+        [print_statistics_cmd(cache_id=str(cache_id), core_id=str(core_id), per_io_class=True,
+                              io_class_id=str(io_class_id), filter=stats_filter,
+                              output_format=OutputFormat.csv.name)
+         for core_id, io_class_id in pairs])
+
+    matrix = None
+    for (core_id, io_class_id), output in zip(pairs, outputs):
+        if output.exit_code != 0:
+            raise Exception(f"Printing statistics of core {core_id} IO class {io_class_id} "
+                            f"failed. stdout: {output.stdout} \n stderr :{output.stderr}")
+        stat_keys, stat_values = output.stdout.splitlines()[0:2]
+        counters, units, values = [], [], []
+        for name, val in zip(stat_keys.split(","), stat_values.split(",")):
+            stat_name, _, stat_unit = name.partition(" [")
+            if (stat_unit == "%]") != percentage_val:
+                continue
+            counters.append(stat_name.lower())
+            units.append(stat_unit.rstrip("]"))
+            values.append(float(val))
+        if matrix is None:
+            matrix = StatsMatrix(core_ids, io_class_ids, counters, units)
+        matrix.set_vector(core_id, io_class_id, values)
+    if matrix is None:
+        matrix = StatsMatrix(core_ids, io_class_ids, [], [])
+    return matrix
+
+
+class CasDiskStats:
+    """
+    Block layer counters (/proc/diskstats) of cache device, core devices and exported objects
+    of a cache; core devices and exported objects are keyed by core id. Much cheaper than
+    casadm block statistics for checks repeated after every IO.
+    """
+    def __init__(self, cache_device: DiskStats, core_devices: dict, exported_objects: dict):
+        self.cache_device = cache_device
+        self.core_devices = core_devices
+        self.exported_objects = exported_objects
+
+    def __sub__(self, other):
+        return CasDiskStats(
+            self.cache_device - other.cache_device,
+            {core_id: stats - other.core_devices[core_id]
+             for core_id, stats in self.core_devices.items()},
+            {core_id: stats - other.exported_objects[core_id]
+             for core_id, stats in self.exported_objects.items()})
+
+
+def get_cas_disk_stats(cache_id: int, cache_device: str, cores: list = None):
+    """
+    Reads CasDiskStats with single /proc/diskstats read. Cores are Core objects; if not given
+    they are taken from casadm list, which costs one more call.
+    """
+    if cores is None:
+        core_paths = {core.core_id: (core.path, core.exp_obj)
+                      for core in CasTopology().get_cores(cache_id)}
+    else:
+        core_paths = {core.core_id: (core.core_device.system_path, core.system_path)
+                      for core in cores}
+    stats = get_disk_stats()
+
+    def get(path):
+        name = path.replace('/dev/', '')
+        if name not in stats:
+            raise Exception(f"No disk stats found for {path}.")
+        return stats[name]
+
+    return CasDiskStats(get(cache_device),
+                        {core_id: get(paths[0]) for core_id, paths in core_paths.items()},
+                        {core_id: get(paths[1]) for core_id, paths in core_paths.items()})
@@ -0,0 +1,157 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import uuid
+from array import array
+from datetime import timedelta
+
+from api.cas.casadm_params import OutputFormat, StatsFilter
+from api.cas import casadm_parser
+from api.cas.cli import print_statistics_cmd
+from api.cas.topology import CasTopology
+from test_package.test_properties import TestProperties
+
+samples_dir = "/tmp/stats_samples"
+
+
+class SampleSeries:
+    """
+    Columnar time series of one statistics target: sample timestamps (DUT clock, seconds)
+    and one int64 column per counter, in casadm units (4KiB blocks or requests).
+    """
+    def __init__(self, counters: list):
+        self.timestamps = array('d')
+        self.columns = {counter: array('q') for counter in counters}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, timestamp: float, values: list):
+        self.timestamps.append(timestamp)
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+
+    def delta(self, counter: str):
+        """Returns change of counter between consecutive samples."""
+        column = self.columns[counter]
+        return array('q', (column[i] - column[i - 1] for i in range(1, len(column))))
+
+    def rate(self, counter: str):
+        """Returns change of counter per second between consecutive samples."""
+        column = self.columns[counter]
+        return array('d', ((column[i] - column[i - 1])
+                           / (self.timestamps[i] - self.timestamps[i - 1])
+                           for i in range(1, len(column))))
+
+    def average_rate(self, counter: str):
+        """Returns change of counter per second between the first and the last sample."""
+        if len(self) < 2:
+            return 0.0
+        column = self.columns[counter]
+        return (column[-1] - column[0]) / (self.timestamps[-1] - self.timestamps[0])
+
+    def duration(self):
+        return timedelta(seconds=self.timestamps[-1] - self.timestamps[0]) if len(self) \
+            else timedelta(0)
+
+
+class StatsSampler:
+    """
+    Samples usage, request and block statistics of a cache, its cores and optionally its
+    IO classes at a fixed interval. Sampling loop runs on the DUT as a background job, so
+    timestamps are not affected by connection latency; rows are appended to csv files and
+    fetched incrementally with fetch().
+    """
+    def __init__(self, cache_id: int, core_ids: list = None, io_class_ids: list = None,
+                 interval: timedelta = timedelta(seconds=1)):
+        self.cache_id = cache_id
+        self.interval = interval
+        if core_ids is None:
+            core_ids = [core.core_id for core in CasTopology().get_cores(cache_id)]
+        self.targets = {"cache": {}}
+        self.targets.update({f"core{core_id}": {"core_id": str(core_id)}
+                             for core_id in core_ids})
+        self.targets.update({f"ioclass{io_class_id}": {"per_io_class": True,
+                                                       "io_class_id": str(io_class_id)}
+                             for io_class_id in io_class_ids or []})
+        self.series = {}
+        self.job = None
+        self.samples_dir = f"{samples_dir}/{uuid.uuid4().hex}"
+        self.__offsets = {target: 0 for target in self.targets}
+        self.__schemas = {}
+
+    def start(self):
+        self.job = TestProperties.executor.start_background_job(self.__get_script())
+        return self
+
+    def stop(self):
+        """Stops sampling and fetches remaining samples."""
+        if self.job is not None and self.job.is_running():
+            self.job.kill()
+            self.job.wait()
+        return self.fetch()
+
+    def fetch(self):
+        """Fetches samples gathered since last fetch in single round trip."""
+        commands = []
+        for target in self.targets:
+            if target not in self.series:
+                commands.append(f"cat {self.samples_dir}/{target}.header")
+            commands.append(f"tail -c +{self.__offsets[target] + 1} "
+                            f"{self.samples_dir}/{target}.csv")
+        outputs = iter(TestProperties.executor.execute_batch(commands))
+
+        for target in self.targets:
+            if target not in self.series:
+                header = next(outputs)
+                if header.exit_code == 0 and header.stdout:
+                    self.series[target] = self.__create_series(target, header.stdout)
+            rows = next(outputs)
+            if rows.exit_code == 0 and target in self.series:
+                self.__parse_rows(target, rows.stdout)
+
+        if not self.series and self.job is not None and not self.job.is_running():
+            raise Exception(f"Statistics sampler failed. "
+                            f"stderr :{self.job.get_output().stderr}")
+        return self.series
+
+    def remove_samples(self):
+        TestProperties.executor.execute(f"rm -rf {self.samples_dir}")
+        if self.job is not None:
+            self.job.remove_output()
+
+    def __get_script(self):
+        stats_filter = ",".join(f.name for f in [StatsFilter.usage, StatsFilter.req,
+                                                 StatsFilter.blk])
+        commands = {target: print_statistics_cmd(cache_id=str(self.cache_id),
+                                                 filter=stats_filter,
+                                                 output_format=OutputFormat.csv.name, **params)
+                    for target, params in self.targets.items()}
+        script = [f"mkdir -p {self.samples_dir}"]
+        script.extend(f"{command} | head -n 1 > {self.samples_dir}/{target}.header"
+                      for target, command in commands.items())
+        script.append("while true; do")
+        script.append("ts=$(date +%s.%N)")
+        # Each row is written with single write, so a fetch never sees a partial line
+        script.extend(f"{command} | awk -v ts=$ts 'NR == 2 {{ print ts \",\" $0 }}' "
+                      f">> {self.samples_dir}/{target}.csv"
+                      for target, command in commands.items())
+        script.append(f"sleep {self.interval.total_seconds()}")
+        script.append("done")
+        return "\n".join(script)
+
+    def __create_series(self, target: str, header: str):
+        # Percentage columns are skipped, they can be derived from absolute values
+        schema = casadm_parser.get_stats_schema(header)
+        self.__schemas[target] = schema
+        return SampleSeries([field.name for field in schema.counter_fields])
+
+    def __parse_rows(self, target: str, rows: str):
+        series = self.series[target]
+        schema = self.__schemas[target]
+        for row in rows.splitlines():
+            self.__offsets[target] += len(row.encode('utf-8')) + 1
+            timestamp, *values = row.split(",")
+            series.append(float(timestamp), schema.parse_counters(values))
@@ -0,0 +1,87 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+from api.cas import casadm
+from api.cas.casadm_params import OutputFormat
+from cas_configuration.cache_config import CacheMode
+
+
+class CacheEntry:
+    def __init__(self, cache_id: int, path: str, status: str, write_policy: str):
+        self.cache_id = cache_id
+        self.path = path
+        self.status = status
+        self.write_policy = write_policy
+        self.cores = {}
+
+    def get_cache_mode(self):
+        return CacheMode[self.write_policy.upper()]
+
+
+class CoreEntry:
+    def __init__(self, cache_id: int, core_id: int, path: str, status: str, exp_obj: str):
+        self.cache_id = cache_id
+        self.core_id = core_id
+        self.path = path
+        self.status = status
+        self.exp_obj = exp_obj
+
+
+class CasTopology:
+    """
+    Index of caches and cores listed by single 'casadm -L -o csv' call, with lookups by
+    cache id, core id, device path and exported object path. It is not updated automatically,
+    call refresh() after starting/stopping caches or adding/removing cores.
+    """
+    def __init__(self, list_output: str = None):
+        self.caches = {}
+        self.__devices = {}
+        self.__exported_objects = {}
+        if list_output is None:
+            self.refresh()
+        else:
+            self.parse(list_output)
+
+    def refresh(self):
+        self.parse(casadm.list_caches(OutputFormat.csv).stdout)
+        return self
+
+    def parse(self, list_output: str):
+        self.caches.clear()
+        self.__devices.clear()
+        self.__exported_objects.clear()
+        cache = None
+        for line in list_output.splitlines():
+            args = line.split(',')
+            if args[0] == "cache":
+                cache = CacheEntry(int(args[1]), args[2], args[3], args[4])
+                self.caches[cache.cache_id] = cache
+                self.__devices[cache.path] = cache
+            elif args[0] == "core" and cache is not None:
+                core = CoreEntry(cache.cache_id, int(args[1]), args[2], args[3], args[5])
+                cache.cores[core.core_id] = core
+                self.__devices[core.path] = core
+                self.__exported_objects[core.exp_obj] = core
+            elif args[0] != "core":
+                # Header line or cores not assigned to any running cache (core pool)
+                cache = None
+
+    def get_cache(self, cache_id: int):
+        return self.caches.get(cache_id)
+
+    def get_cores(self, cache_id: int):
+        cache = self.caches.get(cache_id)
+        return [] if cache is None else list(cache.cores.values())
+
+    def get_core(self, cache_id: int, core_id: int):
+        cache = self.caches.get(cache_id)
+        return None if cache is None else cache.cores.get(core_id)
+
+    def get_by_device(self, path: str):
+        """Returns CacheEntry or CoreEntry of given cache or core device."""
+        return self.__devices.get(path)
+
+    def get_by_exported_object(self, path: str):
+        return self.__exported_objects.get(path)
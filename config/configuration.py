@@ -0,0 +1,16 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+# Defines path to open cas repo
+opencas_repo_path = '/path/to/opencas/repo'
+
+# Test wrapper can be used in order to wrap some behaviours with custom features.
+# By default (set to blank string) it is disabled. Use with caution
+test_wrapper_dir = ''
+
+# This command will be executed before every command that might require a proxy
+# Example use case: exporting proxy in order to access external content
+proxy_command = ''
+cas_init_config_path = "/etc/opencas/opencas.conf"
@@ -11,3 +11,15 @@ disks = [{'path': '/dev/device_name',
           'blocksize': 512}]  # 512B
 user = "example_user"
 password = "example_password"
+
+# Run all commands through one long-lived remote shell instead of opening a new ssh channel
+# per command. Significantly reduces per-command overhead for remote execution.
+persistent_session = False
+
+# Maximum number of ssh channels (or persistent shells) used concurrently, e.g. by commands
+# executed in parallel from multiple threads. Keep it below MaxSessions of DUT's sshd.
+ssh_pool_size = 4
+
+# Serve repeated read-only commands (sysfs reads, 'casadm -L', 'findmnt' etc.) from a cache,
+# which is invalidated whenever a command changing the respective state is executed.
+command_cache = False
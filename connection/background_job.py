@@ -0,0 +1,143 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import shlex
+import signal
+import subprocess
+import threading
+import uuid
+from datetime import timedelta
+
+from test_utils.output import Output
+
+jobs_dir = "/tmp/background_jobs"
+
+
+def get_job_wrapper(command, job_dir):
+    # The job runs in its own session, so it can be killed together with its children. Wrapper
+    # prints job's PID, waits for the job and exits with its exit code, which is also stored
+    # in 'exit_code' file for executors that cannot wait for the wrapper itself.
+    wrapper = f"setsid bash -c {shlex.quote(command)} " \
+        f"> {job_dir}/stdout 2> {job_dir}/stderr < /dev/null &\n" \
+        f"pid=$!\n" \
+        f"echo $pid > {job_dir}/pid\n" \
+        f"echo $pid\n" \
+        f"wait $pid\n" \
+        f"rc=$?\n" \
+        f"echo $rc > {job_dir}/exit_code.tmp && mv {job_dir}/exit_code.tmp {job_dir}/exit_code\n" \
+        f"exit $rc"
+    return f"mkdir -p {job_dir} && bash -c {shlex.quote(wrapper)}"
+
+
+def create_job_dir():
+    return f"{jobs_dir}/{uuid.uuid4().hex}"
+
+
+class BackgroundJob:
+    """
+    Handle of a command started with BaseExecutor.start_background_job(). Stdout and stderr of
+    the job are captured in files on the DUT. This generic implementation checks job state with
+    remote commands; executors able to wait for the job wrapper process return subclasses with
+    event-driven waiting.
+    """
+    def __init__(self, executor, command, pid: int, job_dir: str):
+        self.executor = executor
+        self.command = command
+        self.pid = pid
+        self.job_dir = job_dir
+        self.stdout_path = f"{job_dir}/stdout"
+        self.stderr_path = f"{job_dir}/stderr"
+        self.exit_code = None
+        # Results of commands the job may change are not cached until it finishes
+        self.__cache_categories = set() if executor.command_cache is None else \
+            executor.command_cache.suspend_for(command)
+
+    def poll(self):
+        """Returns exit code of the job or None if it is still running."""
+        if self.exit_code is None:
+            self.__set_exit_code(self._poll())
+        return self.exit_code
+
+    def wait(self, timeout: timedelta = None):
+        """Waits for the job to finish. Returns exit code or None if timeout expired."""
+        if self.exit_code is None:
+            self.__set_exit_code(self._wait(timeout))
+        return self.exit_code
+
+    def is_running(self):
+        return self.poll() is None
+
+    def kill(self, sig: signal.Signals = signal.SIGTERM):
+        output = self.executor.execute(f"kill -{sig.value} -{self.pid}")
+        if output.exit_code != 0 and self.is_running():
+            raise Exception(f"Failed to send {sig.name} to background job {self.pid}. "
+                            f"stdout: {output.stdout} \n stderr :{output.stderr}")
+
+    def get_output(self):
+        stdout, stderr = self.executor.execute_batch([f"cat {self.stdout_path}",
+                                                      f"cat {self.stderr_path}"])
+        return Output(stdout.stdout, stderr.stdout, self.poll())
+
+    def remove_output(self):
+        self.executor.execute(f"rm -rf {self.job_dir}")
+
+    def __set_exit_code(self, exit_code):
+        self.exit_code = exit_code
+        if exit_code is not None and self.__cache_categories:
+            self.executor.command_cache.resume(self.__cache_categories)
+            self.__cache_categories = set()
+
+    def _poll(self):
+        output = self.executor.execute(f"cat {self.job_dir}/exit_code")
+        return int(output.stdout) if output.exit_code == 0 else None
+
+    def _wait(self, timeout: timedelta):
+        wait_cmd = f"while [ ! -e {self.job_dir}/exit_code ]; do sleep 0.1; done"
+        if timeout is not None:
+            wait_cmd = f"timeout {timeout.total_seconds()} bash -c {shlex.quote(wait_cmd)}"
+        self.executor.execute(wait_cmd)
+        return self._poll()
+
+
+class ProcessBackgroundJob(BackgroundJob):
+    def __init__(self, executor, command, pid: int, job_dir: str, process):
+        BackgroundJob.__init__(self, executor, command, pid, job_dir)
+        self.process = process
+
+    def _poll(self):
+        return self.process.poll()
+
+    def _wait(self, timeout: timedelta):
+        try:
+            return self.process.wait(None if timeout is None else timeout.total_seconds())
+        except subprocess.TimeoutExpired:
+            return None
+
+
+class ChannelBackgroundJob(BackgroundJob):
+    def __init__(self, executor, command, pid: int, job_dir: str, channel, on_close=None):
+        BackgroundJob.__init__(self, executor, command, pid, job_dir)
+        self.channel = channel
+        # Channel is closed as soon as exit status arrives, even if the job is never polled;
+        # on_close is called then, e.g. to release its channel pool slot
+        self.__on_close = on_close
+        threading.Thread(target=self.__close_on_exit, daemon=True).start()
+
+    def _poll(self):
+        if not self.channel.exit_status_ready():
+            return None
+        return self.channel.recv_exit_status()
+
+    def _wait(self, timeout: timedelta):
+        if not self.channel.status_event.wait(None if timeout is None
+                                              else timeout.total_seconds()):
+            return None
+        return self.channel.recv_exit_status()
+
+    def __close_on_exit(self):
+        self.channel.status_event.wait()
+        self.channel.close()
+        if self.__on_close is not None:
+            self.__on_close()
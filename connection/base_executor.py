@@ -3,13 +3,39 @@
 # SPDX-License-Identifier: BSD-3-Clause-Clear
 #
 
+import asyncio
+import base64
+import os
+import shlex
+import time
+import uuid
 from datetime import timedelta
 
 from config import configuration
+from connection.background_job import BackgroundJob, create_job_dir, get_job_wrapper
+from test_utils.output import Output, StreamOutput
 
 
 class BaseExecutor:
+    # Size of data chunks sent in a single command or write request during file transfers
+    transfer_chunk_size = 49152
+    # Optional connection.command_cache.CommandCache serving repeated read-only commands
+    command_cache = None
+    # Optional connection.command_statistics.CommandStatistics recording every executed command
+    command_statistics = None
+    # Time given to background job wrapper to report PID of started job
+    background_job_start_timeout = timedelta(seconds=30)
+
     def execute(self, command, timeout: timedelta = timedelta(hours=1)):
+        output = self.__lookup_cache(command)
+        if output is not None:
+            return output
+        start = time.monotonic()
+        output = self._execute(command, timeout)
+        self.__record(command, start, output)
+        return output
+
+    def _execute(self, command, timeout: timedelta = timedelta(hours=1)):
         raise NotImplementedError()
 
     def execute_in_background(self, command, timeout: timedelta = timedelta(hours=1)):
@@ -19,6 +45,159 @@ class BaseExecutor:
         if output is not None:
             return output.stdout
 
+    def start_background_job(self, command):
+        """Starts command in background and returns its BackgroundJob handle."""
+        job_dir = create_job_dir()
+        wait_cmd = shlex.quote(f"while [ ! -s {job_dir}/pid ]; do sleep 0.01; done")
+        output = self.execute(f"( {get_job_wrapper(command, job_dir)} ) > /dev/null 2>&1 &\n"
+                              f"timeout {self.background_job_start_timeout.total_seconds()} "
+                              f"bash -c {wait_cmd} && cat {job_dir}/pid")
+        if output.exit_code != 0:
+            raise Exception(f"Failed to start background job '{command}' within "
+                            f"{self.background_job_start_timeout}. "
+                            f"stdout: {output.stdout} \n stderr :{output.stderr}")
+        return BackgroundJob(self, command, int(output.stdout), job_dir)
+
+    def execute_async(self, command, timeout: timedelta = timedelta(hours=1)):
+        # Same cache and statistics hooks as execute(). Calling function is found before
+        # the coroutine is scheduled - once it runs in a task, its caller is the event loop.
+        caller = None if self.command_statistics is None else \
+            self.command_statistics.get_caller()
+        return self.__execute_async(command, timeout, caller)
+
+    async def __execute_async(self, command, timeout, caller):
+        output = self.__lookup_cache(command)
+        if output is not None:
+            return output
+        start = time.monotonic()
+        output = await self._execute_async(command, timeout)
+        self.__record(command, start, output, caller)
+        return output
+
+    async def _execute_async(self, command, timeout: timedelta = timedelta(hours=1)):
+        # Blocking executors are offloaded to the default thread pool, so independent commands
+        # can be awaited concurrently e.g. with asyncio.gather().
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._execute, command, timeout)
+
+    def __lookup_cache(self, command):
+        if self.command_cache is None:
+            return None
+        return self.command_cache.lookup(command)
+
+    def __record(self, command, start, output, caller=None):
+        if self.command_statistics is not None:
+            self.command_statistics.record(command, time.monotonic() - start, output, caller)
+        if self.command_cache is not None:
+            self.command_cache.store(command, output)
+
+    async def execute_in_background_async(self, command,
+                                          timeout: timedelta = timedelta(hours=1)):
+        command += "&> /dev/null &echo $!"
+        output = await self.execute_async(command, timeout)
+
+        if output is not None:
+            return output.stdout
+
+    def execute_stream(self, command, timeout: timedelta = timedelta(hours=1)):
+        # Fallback for executors without native streaming - output is buffered as a whole
+        def chunks():
+            output = self.execute(command, timeout)
+            yield output.stdout.encode('utf-8')
+            return output.stderr, output.exit_code
+
+        return StreamOutput(chunks())
+
+    def execute_batch(self, commands: list, stop_on_failure: bool = False,
+                      timeout: timedelta = timedelta(hours=1)):
+        """
+        Execute all commands in a single round trip and return one Output per command.
+        With stop_on_failure set, commands following the first failed one are not executed
+        and the returned list is shorter than the list of commands.
+        """
+        if not commands:
+            return []
+        sentinel = f"__test_framework_{uuid.uuid4().hex}__"
+        script = ""
+        for command in commands:
+            script += f"( {command}\n) < /dev/null\n" \
+                f"rc=$?\n" \
+                f"printf '\\n{sentinel} %d\\n' $rc\n" \
+                f"printf '\\n{sentinel}\\n' >&2\n"
+            if stop_on_failure:
+                script += "[ $rc -eq 0 ] || exit $rc\n"
+        output = self.execute(script, timeout)
+
+        stdout_parts = output.stdout.split(f"\n{sentinel} ")
+        stderr_parts = output.stderr.split(f"\n{sentinel}")
+        outputs = []
+        command_stdout = stdout_parts[0]
+        for i, part in enumerate(stdout_parts[1:]):
+            exit_code, _, next_stdout = part.partition('\n')
+            command_stderr = stderr_parts[i][1:] if i > 0 else stderr_parts[i]
+            outputs.append(Output(command_stdout.rstrip(), command_stderr.rstrip(),
+                                  int(exit_code)))
+            command_stdout = next_stdout
+        return outputs
+
+    def write_bytes(self, path, data: bytes, append: bool = False):
+        """
+        Writes binary data to a file on the DUT. This fallback pushes base64 encoded chunks
+        through execute(), executors able to transfer files directly override it.
+        Direct transfers (SFTP, local copy) of this and other transfer methods do not go
+        through execute(), so command_cache, command_statistics and RecordingExecutor do not
+        see them - wrap the executor in RecordingExecutor to capture transfers as commands.
+        Direct transfers raise OSError (e.g. FileNotFoundError) instead of Exception.
+        """
+        for offset in range(0, max(len(data), 1), self.transfer_chunk_size):
+            chunk = base64.b64encode(data[offset:offset + self.transfer_chunk_size])
+            redirection_char = '>>' if append or offset > 0 else '>'
+            output = self.execute(f"printf '{chunk.decode('ascii')}' "
+                                  f"| base64 --decode {redirection_char} {path}")
+            if output.exit_code != 0:
+                raise Exception(f"Failed to write file {path}. "
+                                f"stdout: {output.stdout} \n stderr :{output.stderr}")
+
+    def read_bytes(self, path, offset: int = 0):
+        """Reads binary content of a file on the DUT, starting from given offset."""
+        output = self.execute(f"test -r {path} && tail -c +{offset + 1} {path} | base64 -w 0")
+        if output.exit_code != 0:
+            raise Exception(f"Failed to read file {path}. "
+                            f"stdout: {output.stdout} \n stderr :{output.stderr}")
+        return base64.b64decode(output.stdout)
+
+    def upload_file(self, local_path, remote_path, resume: bool = False, compress: bool = False):
+        """
+        Copies local file to the DUT. With resume, data already present in remote file is
+        not transferred again. Compression is used only by executors transferring data over
+        the network.
+        """
+        if resume and compress:
+            raise ValueError("Compressed transfer cannot be resumed.")
+        self._upload_file(local_path, remote_path, resume, compress)
+
+    def download_file(self, remote_path, local_path, resume: bool = False,
+                      compress: bool = False):
+        """Copies file from the DUT to local path. Parameters as in upload_file()."""
+        if resume and compress:
+            raise ValueError("Compressed transfer cannot be resumed.")
+        self._download_file(remote_path, local_path, resume, compress)
+
+    def _upload_file(self, local_path, remote_path, resume, compress):
+        offset = 0
+        if resume:
+            output = self.execute(f"stat -c %s {remote_path}")
+            offset = int(output.stdout) if output.exit_code == 0 else 0
+        with open(local_path, 'rb') as local_file:
+            local_file.seek(offset)
+            self.write_bytes(remote_path, local_file.read(), append=offset > 0)
+
+    def _download_file(self, remote_path, local_path, resume, compress):
+        offset = os.path.getsize(local_path) if resume and os.path.exists(local_path) else 0
+        data = self.read_bytes(remote_path, offset)
+        with open(local_path, 'ab' if offset > 0 else 'wb') as local_file:
+            local_file.write(data)
+
     def execute_with_proxy(self, command, timeout: timedelta = timedelta(hours=1)):
         if configuration.proxy_command:
             command = f"{configuration.proxy_command} && {command}"
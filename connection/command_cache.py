@@ -0,0 +1,156 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import timedelta
+
+# Read-only commands which may be served from cache, grouped into categories. A command has to
+# match one of the patterns as a whole and must not redirect output or chain other commands.
+cacheable_commands = {
+    "block": [r"cat /sys/(class/)?block/\S+",
+              r"test -[de] /sys/\S+",
+              r"ls /sys/block.*",
+              r"lsblk .*",
+              r"parted --script \S+ print"],
+    "mount": [r"findmnt .*",
+              r"cat /proc/mounts.*"],
+    "cas": [r"casadm (-L|--list-caches).*",
+            r"casadm (-V|--version).*",
+            r"casadm (-G|--get-param) .*",
+            r"casadm (-C -L|--io-class --list) .*"],
+    "tools": [r"fio --version",
+              r"which \S+",
+              r"uname .*"]
+}
+
+# Writes to sysfs, e.g. 'echo 1 > /sys/block/sdb/device/delete' or rescanning SCSI hosts, may
+# add or remove devices, which also changes status of CAS devices and mounts on them
+sysfs_write = r"(>|\btee\b).*/sys/(block|class|bus|devices)/"
+
+# Commands changing the state described by cached commands of given category. Patterns are
+# searched anywhere in the command, so e.g. batch scripts invalidate the cache as well.
+invalidating_commands = {
+    "block": [r"\b(parted|sfdisk|partprobe|wipefs|hdparm -z|udevadm settle|mkfs)\b",
+              r"\bdd\b.*\bof=/dev/",
+              r"\bcasadm\s+(-S|-T|-A|-R|--start-cache|--stop-cache|--add-core|--remove-core"
+              r"|--remove-detached)\b",
+              r"\b(casctl|modprobe|rmmod)\b",
+              sysfs_write],
+    "mount": [r"\b(mount|umount|mkfs)\b",
+              r"\bcasadm\s+(-T|-R|--stop-cache|--remove-core)\b",
+              r"\bcasctl\b",
+              sysfs_write],
+    "cas": [r"\bcasadm\s+(-S|-T|-A|-R|-Q|-X|-Z|-F|-E|-C -C|--start-cache|--stop-cache"
+            r"|--add-core|--remove-core|--remove-detached|--set-cache-mode|--set-param"
+            r"|--reset-counters|--flush-cache|--flush-core|--io-class --load-config)\b",
+            r"\b(casctl|modprobe|rmmod)\b",
+            r"\bmake\s+(un)?install\b",
+            sysfs_write],
+    "tools": [r"\bmake\s+(un)?install\b",
+              r"\b(apt|apt-get|yum|dnf|rpm|pip3?)\b"]
+}
+
+
+class CommandCache:
+    """
+    Opt-in memoization of read-only commands for BaseExecutor. Entries expire after ttl and
+    the least recently used ones are evicted above max_entries. Executing a command matching
+    one of invalidating_commands drops cached entries of the respective categories.
+    While such command runs in background, its categories are not cached at all.
+    Cached outputs are returned as copies, so callers may modify them.
+    """
+    def __init__(self, ttl: timedelta = timedelta(seconds=30), max_entries: int = 256):
+        self.ttl = ttl.total_seconds()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__suspended = defaultdict(int)
+        self.__lock = threading.Lock()
+        self.__cacheable = [(category, re.compile(pattern))
+                            for category, patterns in cacheable_commands.items()
+                            for pattern in patterns]
+        self.__invalidating = [(category, re.compile(pattern))
+                               for category, patterns in invalidating_commands.items()
+                               for pattern in patterns]
+
+    def lookup(self, command):
+        """Returns cached output of command or None. Invalidates cache for mutating commands."""
+        self.invalidate_for(command)
+        category = self.__get_category(command)
+        if category is None:
+            return None
+        with self.__lock:
+            entry = self.__entries.get(command)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl \
+                    and not self.__suspended[category]:
+                self.__entries.move_to_end(command)
+                self.hits += 1
+                return copy.copy(entry[2])
+            self.misses += 1
+            return None
+
+    def store(self, command, output):
+        category = self.__get_category(command)
+        if category is None or output is None:
+            return
+        with self.__lock:
+            if self.__suspended[category]:
+                return
+            self.__entries[command] = (time.monotonic(), category, copy.copy(output))
+            self.__entries.move_to_end(command)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def invalidate_for(self, command):
+        categories = self.__get_invalidated_categories(command)
+        if categories:
+            self.invalidate(categories)
+
+    def suspend_for(self, command):
+        """
+        Stops caching categories changed by command started in background, until
+        resume() is called with returned categories.
+        """
+        categories = self.__get_invalidated_categories(command)
+        with self.__lock:
+            for category in categories:
+                self.__suspended[category] += 1
+        self.invalidate(categories)
+        return categories
+
+    def resume(self, categories):
+        with self.__lock:
+            for category in categories:
+                self.__suspended[category] -= 1
+        self.invalidate(categories)
+
+    def invalidate(self, categories=None):
+        with self.__lock:
+            if categories is None:
+                self.__entries.clear()
+                return
+            for command in [c for c, e in self.__entries.items() if e[1] in categories]:
+                del self.__entries[command]
+
+    def reset_statistics(self):
+        self.hits = 0
+        self.misses = 0
+
+    def __get_invalidated_categories(self, command):
+        return {category for category, pattern in self.__invalidating
+                if pattern.search(command)}
+
+    def __get_category(self, command):
+        if any(c in command for c in [';', '&', '>', '`', '$(', '\n']):
+            return None
+        for category, pattern in self.__cacheable:
+            if pattern.fullmatch(command.strip()):
+                return category
+        return None
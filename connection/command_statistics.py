@@ -0,0 +1,80 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import bisect
+import sys
+import threading
+from collections import defaultdict
+
+# Upper bounds (in milliseconds) of command latency histogram buckets
+histogram_bounds = [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 60000]
+
+# Modules which only pass commands on, so they are skipped when looking for the calling function
+pass_through_modules = ("connection.", "test_package.test_properties", "test_utils.linux_command")
+
+
+class CallerStatistics:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.stdout_bytes = 0
+        self.stderr_bytes = 0
+        self.exit_codes = defaultdict(int)
+        self.histogram = [0] * (len(histogram_bounds) + 1)
+
+    def add(self, duration: float, output):
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.histogram[bisect.bisect_left(histogram_bounds, duration * 1000)] += 1
+        if output is not None:
+            self.stdout_bytes += len(output.stdout.encode('utf-8'))
+            self.stderr_bytes += len(output.stderr.encode('utf-8'))
+            self.exit_codes[output.exit_code] += 1
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in histogram_bounds] + [f">{histogram_bounds[-1]}ms"]
+        return {"count": self.count,
+                "total_time": round(self.total_time, 6),
+                "average_time": round(self.total_time / self.count, 6),
+                "max_time": round(self.max_time, 6),
+                "stdout_bytes": self.stdout_bytes,
+                "stderr_bytes": self.stderr_bytes,
+                "exit_codes": {str(code): n for code, n in self.exit_codes.items()},
+                "histogram": {label: n for label, n in zip(labels, self.histogram) if n}}
+
+
+class CommandStatistics:
+    """
+    Instrumentation hook for BaseExecutor.execute(). Aggregates wall time, output volume and
+    exit codes of executed commands per calling API function (e.g. 'api.cas.casadm.flush').
+    """
+    def __init__(self):
+        self.callers = defaultdict(CallerStatistics)
+        self.__lock = threading.Lock()
+
+    def record(self, command, duration: float, output, caller: str = None):
+        if caller is None:
+            caller = self.get_caller()
+        with self.__lock:
+            self.callers[caller].add(duration, output)
+
+    @staticmethod
+    def get_caller():
+        frame = sys._getframe(1)
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '')
+            if not module.startswith(pass_through_modules):
+                return f"{module}.{frame.f_code.co_name}"
+            frame = frame.f_back
+        return "unknown"
+
+    def to_dict(self):
+        with self.__lock:
+            callers = sorted(self.callers.items(), key=lambda c: c[1].total_time, reverse=True)
+            return {"count": sum(c.count for _, c in callers),
+                    "total_time": round(sum(c.total_time for _, c in callers), 6),
+                    "callers": {name: c.to_dict() for name, c in callers}}
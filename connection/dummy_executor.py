@@ -4,8 +4,13 @@
 #
 
 from connection.base_executor import BaseExecutor
+from test_utils.output import Output
 
 
 class DummyExecutor(BaseExecutor):
-    def execute(self, command, timeout=None):
+    def _execute(self, command, timeout=None):
         print(command)
+        return Output("", "", 0)
+
+    def execute_batch(self, commands: list, stop_on_failure: bool = False, timeout=None):
+        return [self.execute(command, timeout) for command in commands]
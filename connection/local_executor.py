@@ -3,15 +3,24 @@
 # SPDX-License-Identifier: BSD-3-Clause-Clear
 #
 
+import asyncio
+import os
+import select
+import shutil
 import subprocess
+import tempfile
+import time
 from datetime import timedelta
 
+from connection.background_job import ProcessBackgroundJob, create_job_dir, get_job_wrapper
 from connection.base_executor import BaseExecutor
-from test_utils.output import Output
+from test_utils.output import Output, StreamOutput
 
 
 class LocalExecutor(BaseExecutor):
-    def execute(self, command, timeout: timedelta = timedelta(hours=1)):
+    stream_chunk_size = 65536
+
+    def _execute(self, command, timeout: timedelta = timedelta(hours=1)):
         completed_process = subprocess.run(
             command,
             shell=True,
@@ -24,3 +33,94 @@ class LocalExecutor(BaseExecutor):
             completed_process.stderr,
             completed_process.returncode)
         return output
+
+    def start_background_job(self, command):
+        # Wrapper process exits together with the job, so waiting for it is event-driven
+        job_dir = create_job_dir()
+        process = subprocess.Popen(
+            get_job_wrapper(command, job_dir),
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL)
+        pid = process.stdout.readline()
+        process.stdout.close()
+        if not pid.strip():
+            process.wait()
+            raise Exception(f"Failed to start background job '{command}'.")
+        return ProcessBackgroundJob(self, command, int(pid), job_dir, process)
+
+    def write_bytes(self, path, data: bytes, append: bool = False):
+        with open(path, 'ab' if append else 'wb') as file:
+            file.write(data)
+
+    def read_bytes(self, path, offset: int = 0):
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            return file.read()
+
+    def _upload_file(self, local_path, remote_path, resume, compress):
+        self.__copy(local_path, remote_path, resume)
+
+    def _download_file(self, remote_path, local_path, resume, compress):
+        self.__copy(remote_path, local_path, resume)
+
+    @staticmethod
+    def __copy(source, destination, resume):
+        offset = os.path.getsize(destination) if resume and os.path.exists(destination) else 0
+        if offset == 0:
+            shutil.copyfile(source, destination)
+            return
+        with open(source, 'rb') as source_file, open(destination, 'ab') as destination_file:
+            source_file.seek(offset)
+            shutil.copyfileobj(source_file, destination_file)
+
+    async def _execute_async(self, command, timeout: timedelta = timedelta(hours=1)):
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(),
+                                                    timeout.total_seconds())
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(command, timeout.total_seconds())
+
+        return Output(stdout, stderr, process.returncode)
+
+    def execute_stream(self, command, timeout: timedelta = timedelta(hours=1)):
+        if self.command_cache is not None:
+            self.command_cache.invalidate_for(command)
+
+        def chunks():
+            deadline = time.monotonic() + timeout.total_seconds()
+            with tempfile.TemporaryFile() as stderr_file:
+                process = subprocess.Popen(
+                    command,
+                    shell=True,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file)
+                try:
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise subprocess.TimeoutExpired(command, timeout.total_seconds())
+                        ready, _, _ = select.select([process.stdout], [], [], remaining)
+                        if not ready:
+                            continue
+                        chunk = os.read(process.stdout.fileno(), self.stream_chunk_size)
+                        if not chunk:
+                            break
+                        yield chunk
+                    exit_code = process.wait(max(deadline - time.monotonic(), 0))
+                finally:
+                    # Also reached when the consumer abandons the stream
+                    if process.poll() is None:
+                        process.kill()
+                        process.wait()
+                    process.stdout.close()
+                stderr_file.seek(0)
+                return stderr_file.read(), exit_code
+
+        return StreamOutput(chunks())
@@ -0,0 +1,56 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import gzip
+import json
+import threading
+import time
+from datetime import timedelta
+
+from connection.base_executor import BaseExecutor
+
+
+def open_trace_file(path, mode):
+    # Traces are JSON lines, gzip compressed when file name ends with '.gz'
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class RecordingExecutor(BaseExecutor):
+    """
+    Wraps any executor and writes every executed command together with its output, exit code
+    and latency to a trace file, which can be served back by ReplayExecutor without a DUT.
+    """
+    def __init__(self, executor: BaseExecutor, trace_path: str):
+        self.executor = executor
+        self.trace_path = trace_path
+        self.__trace = open_trace_file(trace_path, 'wt')
+        self.__lock = threading.Lock()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        with self.__lock:
+            if not self.__trace.closed:
+                self.__trace.close()
+
+    def _execute(self, command, timeout: timedelta = timedelta(hours=1)):
+        start = time.monotonic()
+        output = self.executor.execute(command, timeout)
+        latency = time.monotonic() - start
+        if output is None:
+            return output
+
+        record = {"command": command,
+                  "stdout": output.stdout,
+                  "stderr": output.stderr,
+                  "exit_code": output.exit_code,
+                  "latency": round(latency, 6)}
+        with self.__lock:
+            self.__trace.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self.__trace.flush()
+        return output
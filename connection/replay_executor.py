@@ -0,0 +1,75 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import json
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import timedelta
+
+from connection.base_executor import BaseExecutor
+from connection.recording_executor import open_trace_file
+from test_utils.output import Output
+
+# Names generated for every run differ between runs, so they are not a part of the key:
+# execute_batch() sentinels and uuid named directories, e.g. of background jobs
+# (/tmp/background_jobs/<uuid>) or statistics samples (/tmp/stats_samples/<uuid>)
+generated_name_pattern = re.compile(r"__test_framework_[0-9a-f]{32}__|(?<=/)[0-9a-f]{32}\b")
+
+
+class ReplayExecutor(BaseExecutor):
+    """
+    Serves outputs recorded by RecordingExecutor. Repeated commands get their recorded outputs
+    in the recorded order; when recorded outputs are used up, the last one is repeated.
+    With simulate_latency set, recorded latency of every command is reproduced.
+    """
+    def __init__(self, trace_path: str, simulate_latency: bool = False):
+        self.trace_path = trace_path
+        self.simulate_latency = simulate_latency
+        self.__records = defaultdict(deque)
+        self.__last_records = {}
+        self.__lock = threading.Lock()
+        with open_trace_file(trace_path, 'rt') as trace:
+            for line in trace:
+                if line.strip():
+                    record = json.loads(line)
+                    self.__records[self.__get_key(record["command"])].append(record)
+
+    def _execute(self, command, timeout: timedelta = timedelta(hours=1)):
+        key = self.__get_key(command)
+        with self.__lock:
+            if self.__records[key]:
+                record = self.__records[key].popleft()
+                self.__last_records[key] = record
+            elif key in self.__last_records:
+                record = self.__last_records[key]
+            else:
+                raise Exception(f"Command '{command}' not found in trace {self.trace_path}.")
+
+        if self.simulate_latency:
+            time.sleep(record["latency"])
+
+        # Generated names in recorded output are replaced with the ones of this run
+        names = dict(zip(self.__get_generated_names(record["command"]),
+                         self.__get_generated_names(command)))
+
+        def replace_names(text):
+            return generated_name_pattern.sub(lambda match: names.get(match.group(),
+                                                                      match.group()), text)
+
+        return Output(replace_names(record["stdout"]), replace_names(record["stderr"]),
+                      record["exit_code"])
+
+    @staticmethod
+    def __get_generated_names(command):
+        # Distinct names in order of first appearance
+        return list(dict.fromkeys(generated_name_pattern.findall(command)))
+
+    @staticmethod
+    def __get_key(command):
+        names = ReplayExecutor.__get_generated_names(command)
+        return generated_name_pattern.sub(
+            lambda match: f"<generated name {names.index(match.group())}>", command)
@@ -0,0 +1,85 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import threading
+from contextlib import contextmanager
+
+from connection.ssh_shell import SshShell
+
+
+class SshChannelPool:
+    """
+    Bounds the number of channels used concurrently on one ssh transport. Checkout is
+    thread-safe, so commands can be run in parallel e.g. from a ThreadPoolExecutor.
+    In persistent session mode the pool also keeps idle remote shells for reuse; they are
+    opened lazily, so single-threaded use never opens more than one. Long-lived channels of
+    background jobs may hold all slots but one, which is always left for commands.
+    """
+    def __init__(self, ssh, ip, size: int, persistent_session: bool):
+        if size < 1:
+            raise ValueError("Channel pool size has to be positive.")
+        self.ssh = ssh
+        self.ip = ip
+        self.size = size
+        self.persistent_session = persistent_session
+        self.__slots = threading.BoundedSemaphore(size)
+        self.__lock = threading.Lock()
+        self.__idle_shells = []
+        self.__job_slots = 0
+
+    @contextmanager
+    def checkout(self, with_shell: bool = True):
+        # with_shell=False reserves a slot only, for callers opening their own channel
+        self.__slots.acquire()
+        shell = None
+        try:
+            if self.persistent_session and with_shell:
+                shell = self.__get_shell()
+            yield shell
+        except Exception:
+            # State of a shell interrupted by an error is unknown, it must not be reused
+            if shell is not None:
+                shell.close()
+            raise
+        finally:
+            if shell is not None:
+                self.__put_shell(shell)
+            self.__slots.release()
+
+    def acquire_job_slot(self):
+        """
+        Reserves a slot for a long-lived channel of a background job until release_job_slot().
+        Does not block; returns False if no slot is free or only the last one is left.
+        """
+        with self.__lock:
+            if self.__job_slots >= self.size - 1 or not self.__slots.acquire(blocking=False):
+                return False
+            self.__job_slots += 1
+            return True
+
+    def release_job_slot(self):
+        with self.__lock:
+            self.__job_slots -= 1
+        self.__slots.release()
+
+    def close(self):
+        with self.__lock:
+            for shell in self.__idle_shells:
+                shell.close()
+            self.__idle_shells.clear()
+
+    def __get_shell(self):
+        with self.__lock:
+            while self.__idle_shells:
+                shell = self.__idle_shells.pop()
+                if shell.is_alive():
+                    return shell
+        return SshShell(self.ssh.get_transport(), self.ip)
+
+    def __put_shell(self, shell):
+        if not shell.is_alive():
+            return
+        with self.__lock:
+            self.__idle_shells.append(shell)
@@ -3,22 +3,39 @@
 # SPDX-License-Identifier: BSD-3-Clause-Clear
 #
 
+import errno
+import os
+import select
+import shutil
 import socket
+import threading
+import time
+import zlib
 from datetime import timedelta
 
 import paramiko
 
+from connection.background_job import ChannelBackgroundJob, create_job_dir, get_job_wrapper
 from connection.base_executor import BaseExecutor
-from test_utils.output import Output
+from connection.ssh_channel_pool import SshChannelPool
+from test_utils.output import Output, StreamOutput
 
 
 class SshExecutor(BaseExecutor):
-    def __init__(self, ip, username, password, port=22):
+    stream_chunk_size = 65536
+
+    def __init__(self, ip, username, password, port=22, persistent_session: bool = False,
+                 pool_size: int = 4):
         self.ip = ip
         self.ssh = paramiko.SSHClient()
+        self.pool = SshChannelPool(self.ssh, ip, pool_size, persistent_session)
+        self.__sftp = None
+        self.__sftp_lock = threading.Lock()
         self.connect(username, password, port)
 
     def __del__(self):
+        self.pool.close()
+        self.__close_sftp()
         self.ssh.close()
 
     def connect(self, user, passwd, port, timeout: timedelta = timedelta(seconds=30)):
@@ -32,16 +49,199 @@ class SshExecutor(BaseExecutor):
 
     def disconnect(self):
         try:
+            self.pool.close()
+            self.__close_sftp()
             self.ssh.close()
         except Exception:
             raise Exception(f"An exception occurred while trying to disconnect from {self.ip}")
 
-    def execute(self, command, timeout: timedelta = timedelta(hours=1)):
+    def _execute(self, command, timeout: timedelta = timedelta(hours=1)):
         try:
-            (stdin, stdout, stderr) = self.ssh.exec_command(command,
-                                                            timeout=timeout.total_seconds())
+            with self.pool.checkout() as shell:
+                if shell is not None:
+                    return shell.execute(command, timeout)
+                (stdin, stdout, stderr) = self.ssh.exec_command(command,
+                                                                timeout=timeout.total_seconds())
+                return Output(stdout.read(), stderr.read(), stdout.channel.recv_exit_status())
         except paramiko.SSHException as e:
             raise ConnectionError(f"An exception occurred while executing command '{command}' on"
                                   f" {self.ip}\n{e}")
 
-        return Output(stdout.read(), stderr.read(), stdout.channel.recv_exit_status())
+    def start_background_job(self, command):
+        # Job wrapper keeps its own channel open until the job exits, so waiting for the job is
+        # event-driven. The channel holds a pool slot until then, so sessions of running jobs
+        # and commands together never exceed the pool size (sshd MaxSessions). When no slot
+        # can be spared, the job is started detached and its state is checked with commands.
+        if not self.pool.acquire_job_slot():
+            return BaseExecutor.start_background_job(self, command)
+        job_dir = create_job_dir()
+        channel = None
+        try:
+            channel = self.ssh.get_transport().open_session()
+            channel.settimeout(self.background_job_start_timeout.total_seconds())
+            channel.exec_command(get_job_wrapper(command, job_dir))
+            pid = channel.makefile('r').readline()
+            channel.settimeout(None)
+        except (paramiko.SSHException, socket.timeout) as e:
+            self.__close_job_channel(channel)
+            raise ConnectionError(f"An exception occurred while starting background job "
+                                  f"'{command}' on {self.ip}\n{e}")
+        if not pid.strip():
+            self.__close_job_channel(channel)
+            raise Exception(f"Failed to start background job '{command}' on {self.ip}.")
+        return ChannelBackgroundJob(self, command, int(pid), job_dir, channel,
+                                    self.pool.release_job_slot)
+
+    def __close_job_channel(self, channel):
+        if channel is not None:
+            channel.close()
+        self.pool.release_job_slot()
+
+    def write_bytes(self, path, data: bytes, append: bool = False):
+        try:
+            with self.__get_sftp().open(path, 'ab' if append else 'wb') as remote_file:
+                # Pipelined writes do not wait for acknowledgement of each request
+                remote_file.set_pipelined(True)
+                remote_file.write(data)
+        except (paramiko.SSHException, EOFError) as e:
+            raise ConnectionError(f"An exception occurred while writing file {path} on "
+                                  f"{self.ip}\n{e}")
+
+    def read_bytes(self, path, offset: int = 0):
+        try:
+            with self.__get_sftp().open(path, 'rb') as remote_file:
+                remote_file.seek(offset)
+                # Prefetch requests all remaining blocks of the file at once
+                remote_file.prefetch()
+                return remote_file.read()
+        except (paramiko.SSHException, EOFError) as e:
+            raise ConnectionError(f"An exception occurred while reading file {path} on "
+                                  f"{self.ip}\n{e}")
+
+    def _upload_file(self, local_path, remote_path, resume, compress):
+        try:
+            if compress:
+                self.__upload_compressed(local_path, remote_path)
+                return
+            sftp = self.__get_sftp()
+            offset = self.__get_remote_size(sftp, remote_path) if resume else 0
+            with open(local_path, 'rb') as local_file, \
+                    sftp.open(remote_path, 'ab' if offset > 0 else 'wb') as remote_file:
+                local_file.seek(offset)
+                remote_file.set_pipelined(True)
+                shutil.copyfileobj(local_file, remote_file, self.transfer_chunk_size)
+        except (paramiko.SSHException, EOFError) as e:
+            raise ConnectionError(f"An exception occurred while uploading {local_path} to "
+                                  f"{remote_path} on {self.ip}\n{e}")
+
+    def _download_file(self, remote_path, local_path, resume, compress):
+        try:
+            if compress:
+                self.__download_compressed(remote_path, local_path)
+                return
+            offset = os.path.getsize(local_path) \
+                if resume and os.path.exists(local_path) else 0
+            with self.__get_sftp().open(remote_path, 'rb') as remote_file, \
+                    open(local_path, 'ab' if offset > 0 else 'wb') as local_file:
+                remote_file.seek(offset)
+                remote_file.prefetch()
+                shutil.copyfileobj(remote_file, local_file, self.transfer_chunk_size)
+        except (paramiko.SSHException, EOFError) as e:
+            raise ConnectionError(f"An exception occurred while downloading {remote_path} "
+                                  f"from {self.ip} to {local_path}\n{e}")
+
+    def __upload_compressed(self, local_path, remote_path):
+        # Data is gzipped on the fly and unpacked by gzip on the DUT
+        compressor = zlib.compressobj(wbits=31)
+        with self.pool.checkout(with_shell=False):
+            channel = self.ssh.get_transport().open_session()
+            try:
+                channel.exec_command(f"gzip -dc > {remote_path}")
+                with open(local_path, 'rb') as local_file:
+                    for chunk in iter(lambda: local_file.read(self.transfer_chunk_size), b''):
+                        channel.sendall(compressor.compress(chunk))
+                channel.sendall(compressor.flush())
+                channel.shutdown_write()
+                exit_code = channel.recv_exit_status()
+                stderr = channel.makefile_stderr('rb').read()
+            finally:
+                channel.close()
+        if exit_code != 0:
+            raise Exception(f"Failed to upload {local_path} to {remote_path} on {self.ip}. "
+                            f"stderr :{Output(b'', stderr, exit_code).stderr}")
+
+    def __download_compressed(self, remote_path, local_path):
+        decompressor = zlib.decompressobj(wbits=31)
+        with self.pool.checkout(with_shell=False):
+            channel = self.ssh.get_transport().open_session()
+            try:
+                channel.exec_command(f"gzip -c {remote_path}")
+                with open(local_path, 'wb') as local_file:
+                    for chunk in iter(lambda: channel.recv(self.transfer_chunk_size), b''):
+                        local_file.write(decompressor.decompress(chunk))
+                    local_file.write(decompressor.flush())
+                exit_code = channel.recv_exit_status()
+                stderr = channel.makefile_stderr('rb').read()
+            finally:
+                channel.close()
+        if exit_code != 0:
+            raise Exception(f"Failed to download {remote_path} from {self.ip}. "
+                            f"stderr :{Output(b'', stderr, exit_code).stderr}")
+
+    @staticmethod
+    def __get_remote_size(sftp, path):
+        try:
+            return sftp.stat(path).st_size
+        except IOError as e:
+            if e.errno == errno.ENOENT:
+                return 0
+            raise
+
+    def __get_sftp(self):
+        # One SFTP session is opened lazily and reused by all transfers
+        with self.__sftp_lock:
+            if self.__sftp is None or self.__sftp.get_channel().closed:
+                self.__sftp = self.ssh.open_sftp()
+            return self.__sftp
+
+    def __close_sftp(self):
+        with self.__sftp_lock:
+            if self.__sftp is not None:
+                self.__sftp.close()
+                self.__sftp = None
+
+    def execute_stream(self, command, timeout: timedelta = timedelta(hours=1)):
+        if self.command_cache is not None:
+            self.command_cache.invalidate_for(command)
+
+        def chunks():
+            deadline = time.monotonic() + timeout.total_seconds()
+            # Streams always use a dedicated channel, also in persistent session mode
+            with self.pool.checkout(with_shell=False):
+                try:
+                    channel = self.ssh.get_transport().open_session()
+                    channel.exec_command(command)
+                except paramiko.SSHException as e:
+                    raise ConnectionError(f"An exception occurred while executing command "
+                                          f"'{command}' on {self.ip}\n{e}")
+                try:
+                    stderr = bytearray()
+                    while True:
+                        # Stderr is drained as well, otherwise it could exhaust channel window
+                        if channel.recv_ready():
+                            yield channel.recv(self.stream_chunk_size)
+                        elif channel.recv_stderr_ready():
+                            stderr += channel.recv_stderr(self.stream_chunk_size)
+                        elif channel.eof_received:
+                            break
+                        else:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                raise socket.timeout(f"Command '{command}' timed out on "
+                                                     f"{self.ip} after {timeout}.")
+                            select.select([channel], [], [], remaining)
+                    return bytes(stderr), channel.recv_exit_status()
+                finally:
+                    channel.close()
+
+        return StreamOutput(chunks())
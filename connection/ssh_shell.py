@@ -0,0 +1,79 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import select
+import socket
+import time
+import uuid
+from datetime import timedelta
+
+from test_utils.output import Output
+
+
+class SshShell:
+    """
+    Long-lived remote shell opened on a channel of an existing paramiko transport.
+    Every command is run in a subshell and followed by a unique sentinel printed on both
+    stdout and stderr, so output and exit code of each command can be split out of the
+    continuous channel streams without opening a new channel per command.
+    """
+    recv_size = 32768
+
+    def __init__(self, transport, ip):
+        self.ip = ip
+        self.channel = transport.open_session()
+        self.channel.exec_command("exec bash")
+
+    def is_alive(self):
+        return not self.channel.closed and not self.channel.exit_status_ready()
+
+    def close(self):
+        self.channel.close()
+
+    def execute(self, command, timeout: timedelta = timedelta(hours=1)):
+        sentinel = f"__test_framework_{uuid.uuid4().hex}__"
+        # Subshell keeps 'cd', 'exit', variables etc. local to the command, like exec_command
+        # does; stdin is detached so the command cannot consume the following frames.
+        self.channel.sendall(f"( {command}\n) < /dev/null\n"
+                             f"printf '\\n{sentinel} %d\\n' $?\n"
+                             f"printf '\\n{sentinel}\\n' >&2\n".encode('utf-8'))
+
+        stdout_marker = f"\n{sentinel} ".encode('utf-8')
+        stderr_marker = f"\n{sentinel}\n".encode('utf-8')
+        stdout, stderr = bytearray(), bytearray()
+        stdout_end, stderr_end = -1, -1
+        deadline = time.monotonic() + timeout.total_seconds()
+
+        while stdout_end < 0 or stderr_end < 0 or not stdout.endswith(b'\n'):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise socket.timeout(f"Command '{command}' timed out on {self.ip} "
+                                     f"after {timeout}.")
+            if not self.channel.recv_ready() and not self.channel.recv_stderr_ready():
+                if self.channel.exit_status_ready():
+                    self.close()
+                    raise ConnectionError(f"Remote shell on {self.ip} terminated while "
+                                          f"executing command '{command}'.")
+                select.select([self.channel], [], [], remaining)
+                continue
+            while self.channel.recv_ready():
+                stdout_end = self.__receive(self.channel.recv, stdout, stdout_marker,
+                                            stdout_end)
+            while self.channel.recv_stderr_ready():
+                stderr_end = self.__receive(self.channel.recv_stderr, stderr, stderr_marker,
+                                            stderr_end)
+
+        exit_code = int(stdout[stdout_end + len(stdout_marker):].strip())
+        return Output(bytes(stdout[:stdout_end]), bytes(stderr[:stderr_end]), exit_code)
+
+    def __receive(self, recv, buffer: bytearray, marker: bytes, marker_position: int):
+        # Only the freshly received tail (plus a marker-sized overlap) is searched, so long
+        # outputs are not rescanned on every chunk.
+        search_start = max(0, len(buffer) - len(marker))
+        buffer += recv(self.recv_size)
+        if marker_position < 0:
+            marker_position = buffer.find(marker, search_start)
+        return marker_position
@@ -8,6 +8,7 @@ import logging
 
 from test_package import conftest
 from test_package.test_properties import TestProperties
+from test_utils.dut_capabilities import get_capabilities
 
 LOGGER = logging.getLogger(__name__)
 
@@ -54,6 +55,7 @@ def install_opencas():
         raise Exception(
             f"Error while installing Open CAS: {output.stdout}\n{output.stderr}")
 
+    get_capabilities().invalidate()
     LOGGER.info("Check if casadm is properly installed.")
     output = TestProperties.executor.execute("casadm -V")
     if output.exit_code != 0:
@@ -71,6 +73,7 @@ def uninstall_opencas():
     else:
         TestProperties.executor.execute(f"cd {opencas_repo_name} && "
                                         f"make uninstall")
+        get_capabilities().invalidate()
         if output.exit_code != 0:
             raise Exception(
                 f"There was an error during uninstall process: {output.stdout}\n{output.stderr}")
@@ -84,8 +87,7 @@ def reinstall_opencas():
 
 def check_if_installed():
     LOGGER.info("Check if Open-CAS-Linux is installed.")
-    output = TestProperties.executor.execute("which casadm")
-    if output.exit_code == 0:
+    if get_capabilities().is_casadm_installed():
         LOGGER.info("CAS is installed")
 
         return True
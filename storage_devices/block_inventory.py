@@ -0,0 +1,178 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import json
+import posixpath
+
+from test_package.test_properties import TestProperties
+from test_tools.disk_utils import Filesystem, PartitionType
+from test_utils.size import Size, Unit
+
+extended_partition_types = ["0x5", "0xf", "0x85"]
+
+
+class BlockDeviceInfo:
+    def __init__(self, name, path, type, size: Size, logical_block_size: int,
+                 physical_block_size: int, rotational: bool, scheduler, fs_type, mount_points,
+                 serial, parent=None):
+        self.name = name
+        self.path = path
+        self.type = type
+        self.size = size
+        self.logical_block_size = logical_block_size
+        self.physical_block_size = physical_block_size
+        self.rotational = rotational
+        self.scheduler = scheduler
+        self.fs_type = fs_type
+        self.mount_points = mount_points
+        self.serial = serial
+        self.parent = parent
+        self.children = []
+        self.partition_table = None
+        self.partition_number = None
+        self.partition_type = None
+        self.partition_type_code = None
+        self.numa_node = None
+
+    @property
+    def mount_point(self):
+        return self.mount_points[0] if self.mount_points else None
+
+    @property
+    def filesystem(self):
+        return Filesystem[self.fs_type] if self.fs_type in Filesystem.__members__ else None
+
+    def __str__(self):
+        return f"{self.path}: {self.type}, size: {self.size}, " \
+            f"block size: {self.logical_block_size}/{self.physical_block_size}, " \
+            f"rotational: {self.rotational}, scheduler: {self.scheduler}, " \
+            f"NUMA node: {self.numa_node}, mount points: {self.mount_points}"
+
+
+class BlockInventory:
+    """
+    Snapshot of all block devices on the DUT, read in one round trip from 'lsblk' JSON output
+    and sysfs. It does not follow changes made on the DUT - call refresh() after creating
+    or removing partitions, filesystems or mounts. If lsblk has no JSON output (util-linux
+    older than 2.27), the snapshot is empty and devices are probed one by one as before.
+    """
+    def __init__(self):
+        self.devices = {}
+        self.links = {}
+        self.available = False
+        self.refresh()
+
+    def refresh(self):
+        outputs = TestProperties.executor.execute_batch([
+            "lsblk -J -b -O",
+            "grep -H . /sys/class/block/*/partition",
+            "grep -H . /sys/block/*/device/numa_node /sys/block/*/device/device/numa_node",
+            "find /dev/disk -type l -printf '%p %l\\n'"
+        ])
+        try:
+            if outputs[0].exit_code != 0:
+                raise ValueError(f"stdout: {outputs[0].stdout} \n stderr :{outputs[0].stderr}")
+            self.parse(*[output.stdout for output in outputs])
+        except (ValueError, KeyError) as e:
+            TestProperties.LOGGER.warning(f"Block device inventory is not available, devices "
+                                          f"will be probed one by one. {e}")
+            self.devices = {}
+            self.links = {}
+            self.available = False
+        return self
+
+    def parse(self, lsblk_output: str, partitions_output: str = "", numa_output: str = "",
+              links_output: str = ""):
+        self.devices = {}
+        self.available = False
+        for device in json.loads(lsblk_output)["blockdevices"]:
+            self.__add_device(device, None)
+
+        for name, value in self.__parse_sysfs_values(partitions_output, 4):
+            if name in self.devices:
+                self.devices[name].partition_number = int(value)
+        for name, value in self.__parse_sysfs_values(numa_output, 3):
+            if name in self.devices and self.devices[name].numa_node is None:
+                self.devices[name].numa_node = int(value)
+        for info in self.devices.values():
+            if info.partition_number is not None and info.parent in self.devices:
+                info.partition_type = self.__get_partition_type(info)
+                info.numa_node = self.devices[info.parent].numa_node
+
+        self.links = {}
+        for line in links_output.splitlines():
+            link, _, target = line.partition(" ")
+            if target:
+                self.links[link] = posixpath.normpath(
+                    posixpath.join(posixpath.dirname(link), target))
+        self.available = True
+        return self
+
+    def get(self, path: str):
+        """Returns BlockDeviceInfo by device path, name or /dev/disk link, None if not found."""
+        path = self.links.get(path, path)
+        return self.devices.get(path.replace("/dev/", "", 1))
+
+    def get_partitions(self, path: str):
+        """Returns info of partitions of given disk ordered by partition number."""
+        info = self.get(path)
+        if info is None:
+            return []
+        partitions = [self.devices[child] for child in info.children
+                      if self.devices[child].partition_number is not None]
+        return sorted(partitions, key=lambda partition: partition.partition_number)
+
+    def get_disks(self):
+        return [info for info in self.devices.values() if info.type == "disk"]
+
+    def __add_device(self, device: dict, parent):
+        name = device["name"]
+        info = BlockDeviceInfo(
+            name=name,
+            path=device.get("path") or f"/dev/{name}",
+            type=device["type"],
+            size=Size(int(device["size"]), Unit.Byte),
+            logical_block_size=int(device["log-sec"]),
+            physical_block_size=int(device["phy-sec"]),
+            rotational=self.__parse_bool(device["rota"]),
+            scheduler=device.get("sched"),
+            fs_type=device.get("fstype"),
+            mount_points=[mount_point for mount_point in
+                          device.get("mountpoints", [device.get("mountpoint")]) if mount_point],
+            serial=device.get("serial"),
+            parent=parent)
+        info.partition_table = device.get("pttype")
+        info.partition_type_code = device.get("parttype")
+        # Device with many holders (e.g. multipath) is listed under each of them
+        if name not in self.devices:
+            self.devices[name] = info
+        if parent is not None and name not in self.devices[parent].children:
+            self.devices[parent].children.append(name)
+        for child in device.get("children", []):
+            self.__add_device(child, name)
+
+    def __get_partition_type(self, info: BlockDeviceInfo):
+        # Same types as shown by 'parted print'; gpt partitions are created as primary
+        parent = self.devices[info.parent]
+        if parent.partition_table == "dos":
+            if info.partition_type_code in extended_partition_types:
+                return PartitionType.extended
+            return PartitionType.primary if info.partition_number <= 4 \
+                else PartitionType.logical
+        return PartitionType.primary
+
+    @staticmethod
+    def __parse_sysfs_values(output: str, name_index: int):
+        # 'grep -H' lines: <sysfs path with device name at name_index>:<value>
+        for line in output.splitlines():
+            path, _, value = line.rpartition(":")
+            name = path.split("/")[name_index]
+            if value.strip().lstrip("-").isdigit() and int(value) >= 0:
+                yield name, value
+
+    @staticmethod
+    def __parse_bool(value):
+        # Older lsblk prints all values as strings
+        return value if isinstance(value, bool) else value == "1"
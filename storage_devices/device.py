@@ -10,11 +10,64 @@ from test_utils.size import Size, Unit
 
 
 class Device:
-    def __init__(self, path):
-        self.size = Size(disk_utils.get_size(path.replace('/dev/', '')), Unit.Byte)
+    """
+    Block device. Its attributes are read from the DUT when first used and memoized; call
+    invalidate() after the device was changed in a way its methods do not track. Attributes
+    set explicitly (e.g. block size from DUT config) are kept by invalidate().
+    """
+    def __init__(self, path, block_info=None):
         self.system_path = path
-        self.filesystem = None
-        self.mount_point = None
+        # block_info is BlockDeviceInfo taken from BlockInventory snapshot, if available
+        self.block_info = block_info
+        self.filesystem = None if block_info is None else block_info.filesystem
+        self.__attributes = {}
+        self.__explicit_attributes = {}
+
+    def invalidate(self):
+        self.__attributes.clear()
+        self.block_info = None
+
+    def __get_attribute(self, name, getter):
+        if name in self.__explicit_attributes:
+            return self.__explicit_attributes[name]
+        if name not in self.__attributes:
+            self.__attributes[name] = getter()
+        return self.__attributes[name]
+
+    @property
+    def size(self):
+        return self.__get_attribute("size", self.__read_size)
+
+    @property
+    def block_size(self):
+        return self.__get_attribute("block_size", self.__read_block_size)
+
+    @block_size.setter
+    def block_size(self, value: Unit):
+        self.__explicit_attributes["block_size"] = value
+
+    @property
+    def mount_point(self):
+        if "mount_point" not in self.__attributes:
+            if self.block_info is not None:
+                self.__attributes["mount_point"] = self.block_info.mount_point
+            else:
+                self.is_mounted()
+        return self.__attributes["mount_point"]
+
+    @mount_point.setter
+    def mount_point(self, value):
+        self.__attributes["mount_point"] = value
+
+    def __read_size(self):
+        if self.block_info is not None:
+            return self.block_info.size
+        return Size(disk_utils.get_size(self.system_path.replace('/dev/', '')), Unit.Byte)
+
+    def __read_block_size(self):
+        if self.block_info is not None:
+            return Unit(self.block_info.logical_block_size)
+        return Unit(int(disk_utils.get_block_size(self.system_path.replace('/dev/', ''))))
 
     def create_filesystem(self, fs_type: disk_utils.Filesystem):
         if disk_utils.create_filesystem(self, fs_type):
@@ -23,6 +76,7 @@ class Device:
     def is_mounted(self):
         output = TestProperties.executor.execute(f"findmnt {self.system_path}")
         if output.exit_code != 0:
+            self.mount_point = None
             return False
         else:
             mount_point_line = output.stdout.split('\n')[1]
@@ -48,6 +102,10 @@ class Device:
         return next(i for i in items if i.full_path.startswith(directory))
 
     def get_all_device_links(self, directory: str):
+        return self.__get_attribute(f"links:{directory}",
+                                    lambda: self.__find_device_links(directory))
+
+    def __find_device_links(self, directory: str):
         from test_tools import fs_utils
         output = fs_utils.ls(f"$(find -L {directory} -samefile {self.system_path})")
         return fs_utils.parse_ls_output(output, self.system_path)
@@ -7,6 +7,7 @@
 from enum import Enum
 from test_utils.size import Size, Unit
 from test_tools import disk_utils
+from storage_devices.block_inventory import BlockInventory
 from storage_devices.partition import Partition
 from storage_devices.device import Device
 from test_package.test_properties import TestProperties
@@ -23,14 +24,29 @@ class DiskType(Enum):
 
 
 class Disk(Device):
-    def __init__(self, path, disk_type: DiskType, serial_number, block_size):
-        Device.__init__(self, path)
+    def __init__(self, path, disk_type: DiskType, serial_number, block_size, inventory=None):
+        Device.__init__(self, path, None if inventory is None else inventory.get(path))
         self.serial_number = serial_number
         self.block_size = Unit(block_size)
         self.disk_type = disk_type
         self.partition_table = None
-        self.partitions = []
-        self.discover_partitions()
+        self.__partitions = None
+        if inventory is not None:
+            self.load_partitions(inventory)
+
+    @property
+    def partitions(self):
+        if self.__partitions is None:
+            self.discover_partitions()
+        return self.__partitions
+
+    @partitions.setter
+    def partitions(self, value: list):
+        self.__partitions = value
+
+    def invalidate(self):
+        Device.invalidate(self)
+        self.__partitions = None
 
     @classmethod
     def cast_to_disk(cls, disk):
@@ -53,6 +69,7 @@ class Disk(Device):
 
 
     def discover_partitions(self):
+        self.partitions = []
         output = TestProperties.executor.execute(f"parted --script {self.system_path} print")
         time.sleep(1)  # parted command makes partitions invisible for a short while
         if output.exit_code != 0:
@@ -67,41 +84,36 @@ class Disk(Device):
                 elif line.startswith("Number"):
                     is_part_line = True
 
+    def load_partitions(self, inventory):
+        """
+        Sets partitions from BlockInventory snapshot without running parted. If the disk is
+        not in the snapshot, partitions are discovered with parted when first accessed.
+        """
+        if inventory.get(self.system_path) is None:
+            self.partitions = None
+            return
+        self.partitions = [
+            Partition(self, info.partition_type, info.partition_number, info)
+            for info in inventory.get_partitions(self.system_path)
+            if info.partition_type != disk_utils.PartitionType.extended]
+
     def create_partitions(
             self,
             sizes: [],
             partition_table_type=disk_utils.PartitionTable.msdos
     ):
-        if disk_utils.create_partition_table(self, partition_table_type):
-            self.partition_table = partition_table_type
-            partition_type = disk_utils.PartitionType.primary
-
-            partition_number_offset = 0
-            for s in sizes:
-                size = Size(
-                    s.get_value(self.block_size) - self.block_size.value, self.block_size)
-                if partition_table_type == disk_utils.PartitionTable.msdos and \
-                        len(sizes) > 4 and len(self.partitions) == 3:
-                    disk_utils.create_partition(self,
-                                                Size.zero(),
-                                                4,
-                                                disk_utils.PartitionType.extended,
-                                                Unit.MebiByte,
-                                                True)
-                    partition_type = disk_utils.PartitionType.logical
-                    partition_number_offset = 1
-
-                partition_number = len(self.partitions) + 1 + partition_number_offset
-                if disk_utils.create_partition(self,
-                                               size,
-                                               partition_number,
-                                               partition_type,
-                                               Unit.MebiByte,
-                                               True):
-                    new_part = Partition(self,
-                                         partition_type,
-                                         partition_number)
-                    self.partitions.append(new_part)
+        sizes = [Size(s.get_value(self.block_size) - self.block_size.value, self.block_size)
+                 for s in sizes]
+        disk_utils.create_partition_layout(self, sizes, partition_table_type)
+        self.partition_table = partition_table_type
+
+        inventory = BlockInventory()
+        self.invalidate()
+        self.block_info = inventory.get(self.system_path)
+        self.load_partitions(inventory)
+        if len(self.partitions) != len(sizes):
+            raise Exception(f"Created {len(self.partitions)} partitions on {self.system_path} "
+                            f"instead of {len(sizes)}.")
 
     def remove_partitions(self):
         for part in self.partitions:
@@ -8,8 +8,10 @@ from test_tools import disk_utils
 
 
 class Partition(Device):
-    def __init__(self, parent_dev, type, number):
-        Device.__init__(self, disk_utils.get_partition_path(parent_dev.system_path, number))
+    def __init__(self, parent_dev, type, number, block_info=None):
+        path = disk_utils.get_partition_path(parent_dev.system_path, number) \
+            if block_info is None else block_info.path
+        Device.__init__(self, path, block_info)
         self.number = number
         self.parent_device = parent_dev
         self.type = type
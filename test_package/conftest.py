@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: BSD-3-Clause-Clear
 #
 
+import json
 import logging
 import pytest
 import os
@@ -17,6 +18,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), os.path.pardir))
 import config.configuration as c
 from connection.ssh_executor import SshExecutor
 from connection.local_executor import LocalExecutor
+from connection.command_cache import CommandCache
+from connection.command_statistics import CommandStatistics
 from test_package.test_properties import TestProperties
 from test_utils.dut import Dut
 if os.path.exists(c.test_wrapper_dir):
@@ -30,6 +33,7 @@ LOGGER = logging.getLogger(__name__)
 
 
 pytest_options = {}
+command_statistics = {}
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -73,7 +77,13 @@ def prepare_and_cleanup(request):
             try:
                 IP(dut_config.ip)
                 if hasattr(dut_config, 'user') and hasattr(dut_config, 'password'):
-                    executor = SshExecutor(dut_config.ip, dut_config.user, dut_config.password)
+                    persistent_session = dut_config.persistent_session \
+                        if hasattr(dut_config, 'persistent_session') else False
+                    pool_size = dut_config.ssh_pool_size \
+                        if hasattr(dut_config, 'ssh_pool_size') else 4
+                    executor = SshExecutor(dut_config.ip, dut_config.user, dut_config.password,
+                                           persistent_session=persistent_session,
+                                           pool_size=pool_size)
                     TestProperties.executor = executor
                 else:
                     raise Exception("There is no credentials in config file.")
@@ -93,7 +103,15 @@ def prepare_and_cleanup(request):
     else:
         raise Exception(
             "There is neither configuration file nor test wrapper attached to tests execution.")
+    if hasattr(dut_config, 'command_cache') and dut_config.command_cache:
+        TestProperties.executor.command_cache = CommandCache()
+    TestProperties.executor.command_statistics = CommandStatistics()
     yield
+    dump_command_statistics(request)
+    if TestProperties.executor.command_cache is not None:
+        cache = TestProperties.executor.command_cache
+        TestProperties.LOGGER.info(f"Command cache hits: {cache.hits}, misses: {cache.misses}")
+        cache.reset_statistics()
     TestProperties.LOGGER.info("Test cleanup")
     Udev.enable()
     unmount_cas_devices()
@@ -102,6 +120,17 @@ def prepare_and_cleanup(request):
         test_wrapper.cleanup(TestProperties.dut)
 
 
+def dump_command_statistics(request):
+    # Statistics of all tests executed in the session are kept in one file next to pytest.log
+    test_statistics = TestProperties.executor.command_statistics.to_dict()
+    LOGGER.info(f"Executed {test_statistics['count']} commands "
+                f"in {test_statistics['total_time']}s")
+    command_statistics[request.node.name] = test_statistics
+    log_dir = os.path.dirname(os.path.abspath(request.config.getini("log_file")))
+    with open(os.path.join(log_dir, "command_statistics.json"), 'w') as f:
+        json.dump(command_statistics, f, indent=2)
+
+
 def pytest_addoption(parser):
     parser.addoption("--dut-config", action="store", default="None")
     parser.addoption("--remote", action="store", default="origin")
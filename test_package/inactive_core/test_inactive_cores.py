@@ -102,7 +102,9 @@ def test_core_inactive_stats(prepare_and_cleanup):
         cores_clean += core_stats["clean"].value
         cores_dirty += core_stats["dirty"].value
 
-    cache_stats = cache.get_cache_statistics()
+    # Absolute and percentage values are taken from the same casadm call
+    cache_stats_snapshot = cache.get_statistics_snapshot()
+    cache_stats = cache_stats_snapshot.stats
     # Add inactive core stats
     cores_occupancy += cache_stats["inactive occupancy"].value
     cores_clean += cache_stats["inactive clean"].value
@@ -112,7 +114,7 @@ def test_core_inactive_stats(prepare_and_cleanup):
     assert cache_stats["dirty"].value == cores_dirty
     assert cache_stats["clean"].value == cores_clean
 
-    cache_stats_percentage = cache.get_cache_statistics(percentage_val=True)
+    cache_stats_percentage = cache_stats_snapshot.percentage_stats
     # Calculate expected percentage value of inactive core stats
     inactive_occupancy_perc = (
         cache_stats["inactive occupancy"].value / cache_stats["cache size"].value
@@ -0,0 +1,141 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+from datetime import timedelta
+
+import pytest
+
+from api.cas import ioclass_config
+from api.cas.cli import load_io_classes_cmd
+from test_package.io_class.test_io_classification import mountpoint, prepare
+from test_package.test_properties import TestProperties
+from test_tools.disk_utils import Filesystem
+from test_tools.fio.fio import Fio
+from test_tools.fio.fio_param import IoEngine, ReadWrite
+from test_utils.size import Size, Unit
+
+ioclass_config_path = "/tmp/opencas_ioclass.conf"
+io_depths = [1, 32]
+fio_run_time = timedelta(seconds=10)
+fio_file_size = Size(512, Unit.MebiByte)
+# Condition counts grow by this factor up to the maximum which fits into IO classes
+condition_count_step = 4
+
+# Allowed QD1 latency growth between default config and maximal number of conditions.
+# The curve is only logged unless it is set, as latency depends on the DUT.
+max_latency_ratio = None
+
+# Conditions never match the benchmark IO, so every IO is checked against all of them
+rule_generators = {
+    "extension": lambda count: ioclass_config.extension_rules(count),
+    "lba": lambda count: ioclass_config.lba_range_rules(count, start=2 ** 40),
+    "directory": lambda count: ioclass_config.directory_rules(count),
+    "file_size": lambda count: (f"file_size:eq:{i + 1}" for i in range(count)),
+    "pid": lambda count: ioclass_config.pid_rules(range(4194304 - count, 4194304)),
+}
+# Raw block IO has no inode nor dentry, so these are evaluated only for IO to files
+file_rule_types = ["extension", "directory", "file_size"]
+
+
+@pytest.mark.parametrize("rule_type", rule_generators.keys())
+@pytest.mark.parametrize(
+    "prepare_and_cleanup", [{"core_count": 1, "cache_count": 1}], indirect=True
+)
+def test_ioclass_scaling(prepare_and_cleanup, rule_type):
+    """
+    Measure IO class config load time and per-IO latency on exported object as the number
+    of conditions of one rule type grows up to maximum packed into all IO classes.
+    """
+    cache, core = prepare()
+    target = core.system_path
+    if rule_type in file_rule_types:
+        core.create_filesystem(Filesystem.ext4)
+        core.mount(mountpoint)
+        target = f"{mountpoint}/ioclass_scaling_test_file"
+
+    baseline = {io_depth: run_fio(target, io_depth) for io_depth in io_depths}
+    TestProperties.LOGGER.info("Default config: " + ", ".join(
+        f"QD{io_depth} {latency:.2f}us" for io_depth, latency in baseline.items()))
+
+    curve = []
+    for count in get_condition_counts(rule_type):
+        config = create_config(rule_type, count)
+        config.save(ioclass_config_path)
+
+        load_time = load_io_classes(cache.cache_id)
+        latencies = {io_depth: run_fio(target, io_depth) for io_depth in io_depths}
+        curve.append((count, len(config) - 1, load_time, latencies))
+
+    TestProperties.LOGGER.info(f"IO class scaling for '{rule_type}' rules:")
+    TestProperties.LOGGER.info("conditions | IO classes | load time [ms] | " + " | ".join(
+        f"QD{io_depth} latency [us]" for io_depth in io_depths))
+    for count, ioclass_count, load_time, latencies in curve:
+        TestProperties.LOGGER.info(
+            f"{count} | {ioclass_count} | {load_time.total_seconds() * 1000:.2f} | "
+            + " | ".join(f"{latencies[io_depth]:.2f}" for io_depth in io_depths))
+
+    max_count, max_latency = curve[-1][0], curve[-1][3][1]
+    assert max_latency_ratio is None or max_latency <= baseline[1] * max_latency_ratio, \
+        f"QD1 latency with {max_count} '{rule_type}' conditions is " \
+        f"{max_latency:.2f}us, with default config {baseline[1]:.2f}us."
+
+
+def create_config(rule_type: str, count: int):
+    config = ioclass_config.IoClassConfig(add_default_rule=True)
+    config.add_rules(rule_generators[rule_type](count), eviction_priority=22, allocation=True)
+    return config
+
+
+def get_condition_counts(rule_type: str):
+    """
+    Returns condition counts growing by condition_count_step, ending with the maximal
+    count of conditions which add_rules() packs into free IO classes.
+    """
+    def fits(count):
+        try:
+            create_config(rule_type, count)
+            return True
+        except ValueError:
+            return False
+
+    counts = [1]
+    while fits(counts[-1] * condition_count_step):
+        counts.append(counts[-1] * condition_count_step)
+    low, high = counts[-1], counts[-1] * condition_count_step
+    while high - low > 1:
+        middle = (low + high) // 2
+        low, high = (middle, high) if fits(middle) else (low, middle)
+    if low != counts[-1]:
+        counts.append(low)
+    return counts
+
+
+def load_io_classes(cache_id: int):
+    # Load time is measured on the DUT, so it does not include connection latency
+    command = f"start=$(date +%s%N) && " \
+              f"{load_io_classes_cmd(str(cache_id), ioclass_config_path)} > /dev/null && " \
+              f"echo $(($(date +%s%N) - start))"
+    output = TestProperties.executor.execute(command)
+    if output.exit_code != 0:
+        raise Exception(
+            f"Load IO class command failed. stdout: {output.stdout} \n stderr :{output.stderr}")
+    return timedelta(microseconds=int(output.stdout) // 1000)
+
+
+def run_fio(target: str, io_depth: int):
+    """Returns average completion latency of 4KiB random reads in microseconds."""
+    results = Fio().create_command() \
+        .target(target) \
+        .size(fio_file_size) \
+        .io_engine(IoEngine.libaio) \
+        .read_write(ReadWrite.randread) \
+        .block_size(Size(4, Unit.KibiByte)) \
+        .io_depth(io_depth) \
+        .direct() \
+        .run_time(fio_run_time) \
+        .time_based() \
+        .run()
+    assert results[0].total_errors() == 0
+    return results[0].read_completion_latency_average()
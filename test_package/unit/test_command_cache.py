@@ -0,0 +1,133 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+from datetime import timedelta
+
+from connection import command_cache
+from connection.command_cache import CommandCache
+from connection.local_executor import LocalExecutor
+from test_utils.output import Output
+
+
+def cache_with(commands, **kwargs):
+    cache = CommandCache(**kwargs)
+    for command in commands:
+        cache.store(command, Output(command, "", 0))
+    return cache
+
+
+def test_cacheable_commands_are_keyed_by_whole_command():
+    cache = cache_with(["lsblk -b", "findmnt /dev/sdb1"])
+
+    assert cache.lookup("lsblk -b").stdout == "lsblk -b"
+    assert cache.lookup("findmnt /dev/sdb1").stdout == "findmnt /dev/sdb1"
+    assert cache.lookup("lsblk -J") is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_not_cacheable_commands_are_not_stored():
+    cache = cache_with(["ls /tmp", "lsblk -b > /tmp/out", "lsblk -b; rm -rf /tmp/x",
+                        "cat /sys/block/$(ls)/size"])
+
+    for command in ["ls /tmp", "lsblk -b > /tmp/out", "lsblk -b; rm -rf /tmp/x",
+                    "cat /sys/block/$(ls)/size"]:
+        assert cache.lookup(command) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(command_cache.time, "monotonic", lambda: now[0])
+    cache = cache_with(["uname -r"], ttl=timedelta(seconds=10))
+
+    now[0] += 9
+    assert cache.lookup("uname -r") is not None
+    now[0] += 1
+    assert cache.lookup("uname -r") is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = cache_with(["uname -r", "uname -a"], max_entries=2)
+    cache.lookup("uname -r")
+    cache.store("uname -m", Output("x86_64", "", 0))
+
+    assert cache.lookup("uname -a") is None
+    assert cache.lookup("uname -r") is not None
+    assert cache.lookup("uname -m") is not None
+
+
+def test_lookup_returns_copies():
+    cache = cache_with(["uname -r"])
+
+    cache.lookup("uname -r").stdout = "modified"
+
+    assert cache.lookup("uname -r").stdout == "uname -r"
+
+
+def test_mutating_command_invalidates_its_categories_only():
+    cache = cache_with(["lsblk -b", "findmnt /dev/sdb1", "casadm -L", "fio --version"])
+
+    cache.lookup("parted --script /dev/sdb mklabel gpt")
+
+    assert cache.lookup("lsblk -b") is None
+    assert cache.lookup("findmnt /dev/sdb1") is not None
+    assert cache.lookup("casadm -L") is not None
+    assert cache.lookup("fio --version") is not None
+
+
+def test_sysfs_writes_invalidate_block_devices():
+    for command in ["echo 1 > /sys/block/sdb/device/delete",
+                    "echo - - - > /sys/class/scsi_host/host0/scan",
+                    "echo 1 | tee /sys/bus/pci/devices/0000:01:00.0/remove"]:
+        cache = cache_with(["lsblk -b"])
+        cache.invalidate_for(command)
+        assert cache.lookup("lsblk -b") is None, command
+
+
+def test_device_removal_invalidates_cas_status_and_mounts():
+    # Removing core device makes the core inactive and changes mounts of its exported object
+    cache = cache_with(["casadm -L -o csv", "findmnt /dev/cas1-1", "uname -r"])
+
+    cache.invalidate_for("echo 1 > /sys/block/sdb/device/delete")
+
+    assert cache.lookup("casadm -L -o csv") is None
+    assert cache.lookup("findmnt /dev/cas1-1") is None
+    assert cache.lookup("uname -r") is not None
+
+
+def test_cas_state_changes_invalidate_cas_commands():
+    cache = cache_with(["casadm -L", "casadm -G --name cleaning -i 1"])
+
+    cache.invalidate_for("casadm --flush-cache --cache-id 1")
+
+    assert cache.lookup("casadm -L") is None
+    assert cache.lookup("casadm -G --name cleaning -i 1") is None
+
+
+def test_categories_are_not_cached_while_background_command_runs():
+    cache = CommandCache()
+    categories = cache.suspend_for("casadm --flush-cache --cache-id 1")
+
+    cache.store("casadm -L", Output("flushing", "", 0))
+    assert cache.lookup("casadm -L") is None
+    cache.store("uname -r", Output("5.0", "", 0))
+    assert cache.lookup("uname -r") is not None
+
+    cache.resume(categories)
+    cache.store("casadm -L", Output("running", "", 0))
+    assert cache.lookup("casadm -L").stdout == "running"
+
+
+def test_background_job_suspends_cache_until_it_finishes():
+    executor = LocalExecutor()
+    executor.command_cache = CommandCache()
+
+    job = executor.start_background_job("sleep 0.2; true casadm --flush-cache")
+    executor.command_cache.store("casadm -L", Output("flushing", "", 0))
+    assert executor.command_cache.lookup("casadm -L") is None
+
+    assert job.wait() == 0
+    job.remove_output()
+    executor.command_cache.store("casadm -L", Output("running", "", 0))
+    assert executor.command_cache.lookup("casadm -L") is not None
@@ -0,0 +1,58 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+from connection.dummy_executor import DummyExecutor
+from connection.local_executor import LocalExecutor
+
+
+def test_execute_batch_splits_outputs():
+    outputs = LocalExecutor().execute_batch([
+        "echo first; echo error >&2",
+        "printf 'no newline'",
+        "echo line1; echo line2; exit 3",
+        "true",
+    ])
+
+    assert len(outputs) == 4
+    assert (outputs[0].stdout, outputs[0].stderr, outputs[0].exit_code) == \
+        ("first", "error", 0)
+    assert (outputs[1].stdout, outputs[1].stderr, outputs[1].exit_code) == \
+        ("no newline", "", 0)
+    assert (outputs[2].stdout, outputs[2].stderr, outputs[2].exit_code) == \
+        ("line1\nline2", "", 3)
+    assert (outputs[3].stdout, outputs[3].stderr, outputs[3].exit_code) == ("", "", 0)
+
+
+def test_execute_batch_commands_do_not_read_stdin():
+    outputs = LocalExecutor().execute_batch(["cat", "echo after"])
+
+    assert outputs[0].stdout == ""
+    assert outputs[1].stdout == "after"
+
+
+def test_execute_batch_stop_on_failure():
+    outputs = LocalExecutor().execute_batch(
+        ["echo ok", "echo failed >&2; false", "echo skipped"], stop_on_failure=True)
+
+    assert len(outputs) == 2
+    assert outputs[0].exit_code == 0
+    assert (outputs[1].stderr, outputs[1].exit_code) == ("failed", 1)
+
+
+def test_execute_batch_without_stop_on_failure_runs_all():
+    outputs = LocalExecutor().execute_batch(["false", "echo next"])
+
+    assert [output.exit_code for output in outputs] == [1, 0]
+    assert outputs[1].stdout == "next"
+
+
+def test_execute_batch_empty():
+    assert LocalExecutor().execute_batch([]) == []
+
+
+def test_dummy_executor_batch_returns_outputs():
+    outputs = DummyExecutor().execute_batch(["ls", "pwd"])
+
+    assert [output.exit_code for output in outputs] == [0, 0]
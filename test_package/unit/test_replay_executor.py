@@ -0,0 +1,50 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import uuid
+
+from connection.local_executor import LocalExecutor
+from connection.recording_executor import RecordingExecutor
+from connection.replay_executor import ReplayExecutor
+
+
+def run_background_job(executor):
+    job = executor.start_background_job("echo started; sleep 0.1; echo failed >&2; exit 3")
+    exit_code = job.wait()
+    output = job.get_output()
+    job.remove_output()
+    return job.pid, exit_code, output.stdout, output.stderr
+
+
+def run_samples_commands(executor):
+    samples_dir = f"/tmp/stats_samples/{uuid.uuid4().hex}"
+    outputs = executor.execute_batch([f"mkdir -p {samples_dir} && echo 1 > {samples_dir}/x",
+                                      f"ls -d {samples_dir} && cat {samples_dir}/x",
+                                      f"rm -rf {samples_dir}"])
+    return samples_dir, [output.stdout for output in outputs]
+
+
+def test_background_job_is_replayed(tmp_path):
+    trace_path = str(tmp_path / "trace.jsonl.gz")
+    recorder = RecordingExecutor(LocalExecutor(), trace_path)
+    recorded = run_background_job(recorder)
+    recorder.close()
+
+    replayed = run_background_job(ReplayExecutor(trace_path))
+
+    assert recorded[1:] == (3, "started", "failed")
+    assert replayed == recorded
+
+
+def test_generated_paths_in_output_follow_replayed_command(tmp_path):
+    trace_path = str(tmp_path / "trace.jsonl")
+    recorder = RecordingExecutor(LocalExecutor(), trace_path)
+    recorded_dir, recorded = run_samples_commands(recorder)
+    recorder.close()
+
+    replayed_dir, replayed = run_samples_commands(ReplayExecutor(trace_path))
+
+    assert recorded == ["", f"{recorded_dir}\n1", ""]
+    assert replayed == ["", f"{replayed_dir}\n1", ""]
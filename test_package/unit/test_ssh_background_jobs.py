@@ -0,0 +1,189 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import io
+import os
+import subprocess
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from api.cas import casadm  # noqa: F401 - casadm has to be imported before other api modules
+from api.cas.flush_monitor import FlushMonitor
+from connection import ssh_executor
+from connection.background_job import ChannelBackgroundJob
+from test_package.test_properties import TestProperties
+
+
+class FakeTransport:
+    """Runs ssh channels as local processes and tracks how many sessions are open at once."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions = 0
+        self.max_sessions = 0
+
+    def open_session(self):
+        self.change_sessions(1)
+        return FakeChannel(self)
+
+    def change_sessions(self, delta: int):
+        with self.lock:
+            self.sessions += delta
+            self.max_sessions = max(self.max_sessions, self.sessions)
+
+
+class FakeChannel:
+    def __init__(self, transport: FakeTransport):
+        self.transport = transport
+        self.status_event = threading.Event()
+        self.process = None
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        self.process = subprocess.Popen(command, shell=True, executable="/bin/bash",
+                                        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL)
+        threading.Thread(target=self.__wait, daemon=True).start()
+
+    def makefile(self, mode):
+        return io.TextIOWrapper(self.process.stdout)
+
+    def exit_status_ready(self):
+        return self.status_event.is_set()
+
+    def recv_exit_status(self):
+        self.status_event.wait()
+        return self.process.returncode
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.transport.change_sessions(-1)
+
+    def __wait(self):
+        self.process.wait()
+        self.status_event.set()
+
+
+class FakeCommandChannel:
+    def __init__(self, exit_status: int):
+        self.exit_status = exit_status
+
+    def recv_exit_status(self):
+        return self.exit_status
+
+
+class FakeStream:
+    def __init__(self, data, channel=None):
+        self.data = data
+        self.channel = channel
+
+    def read(self):
+        return self.data
+
+
+class FakeSshClient:
+    def __init__(self):
+        self.transport = FakeTransport()
+
+    def set_missing_host_key_policy(self, policy):
+        pass
+
+    def connect(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+    def get_transport(self):
+        return self.transport
+
+    def exec_command(self, command, timeout=None):
+        self.transport.change_sessions(1)
+        try:
+            result = subprocess.run(command, shell=True, executable="/bin/bash",
+                                    stdin=subprocess.DEVNULL, capture_output=True)
+        finally:
+            self.transport.change_sessions(-1)
+        return None, FakeStream(result.stdout, FakeCommandChannel(result.returncode)), \
+            FakeStream(result.stderr)
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(ssh_executor.paramiko, "SSHClient", FakeSshClient)
+    return ssh_executor.SshExecutor("fake", "user", "password", pool_size=2)
+
+
+def run_with_timeout(function, timeout: float = 10):
+    thread = threading.Thread(target=function, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "Command did not finish, channel pool is exhausted."
+
+
+def test_one_channel_is_left_for_commands(executor):
+    jobs = [executor.start_background_job("sleep 30") for _ in range(3)]
+
+    assert [isinstance(job, ChannelBackgroundJob) for job in jobs] == [True, False, False]
+    run_with_timeout(lambda: [job.kill() for job in jobs])
+    for job in jobs:
+        assert job.wait(timedelta(seconds=10)) is not None
+        job.remove_output()
+    assert executor.ssh.transport.max_sessions <= executor.pool.size
+
+
+def test_slot_is_released_when_job_exits_without_polling(executor):
+    job = executor.start_background_job("true")
+    deadline = time.monotonic() + 10
+    while not job.channel.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    next_job = executor.start_background_job("true")
+
+    assert isinstance(next_job, ChannelBackgroundJob)
+    for started_job in [job, next_job]:
+        assert started_job.wait(timedelta(seconds=10)) == 0
+        started_job.remove_output()
+
+
+fake_casadm = """#!/bin/bash
+# Cache 1 flushes 100 dirty blocks every 0.1s
+dirty_file=$(dirname $0)/dirty
+case "$*" in
+*--flush-cache*)
+    for dirty in 300 200 100 0; do sleep 0.1; echo $dirty > $dirty_file; done ;;
+*--stats*)
+    echo "Occupancy [4KiB blocks],Occupancy [%],Dirty [4KiB blocks],Dirty [%]"
+    echo "1000,50.0,$(cat $dirty_file),20.0" ;;
+esac
+"""
+
+
+@pytest.mark.parametrize("pool_size", [1, 2])
+def test_flush_monitor_with_small_pool(monkeypatch, tmp_path, pool_size):
+    casadm = tmp_path / "casadm"
+    casadm.write_text(fake_casadm)
+    casadm.chmod(0o755)
+    (tmp_path / "dirty").write_text("400\n")
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    monkeypatch.setattr(ssh_executor.paramiko, "SSHClient", FakeSshClient)
+    executor = ssh_executor.SshExecutor("fake", "user", "password", pool_size=pool_size)
+    monkeypatch.setattr(TestProperties, "executor", executor)
+
+    monitor = FlushMonitor(1, interval=timedelta(seconds=0.05)).start()
+    run_with_timeout(monitor.get_samples)
+    run_with_timeout(lambda: monitor.wait(timedelta(seconds=10)))
+
+    assert monitor.job.poll() == 0
+    assert monitor.get_samples().columns["dirty"][0] == 400
+    assert monitor.get_dirty() is not None
+    monitor.remove_samples()
+    assert executor.ssh.transport.max_sessions <= pool_size
@@ -0,0 +1,118 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import logging
+import time
+from datetime import timedelta
+
+import pytest
+
+from api.cas import casadm, casadm_parser  # noqa: F401 - casadm has to be imported first
+from test_utils.size import Size, Unit, parse_unit
+
+cache_header = "Cache Id,Cache Size [4KiB Blocks],Cache Size [GiB],Cache Device," \
+               "Core Devices,Inactive Core Devices,Write Policy,Eviction Policy," \
+               "Cleaning Policy,Cache line size [KiB],Metadata Memory Footprint [MiB]," \
+               "Dirty for [s],Dirty for,Metadata Mode,Status," \
+               "Occupancy [4KiB blocks],Occupancy [%],Dirty [4KiB blocks],Dirty [%]," \
+               "Read hits [Requests],Read hits [%],Serviced requests [Requests]," \
+               "Serviced requests [%],Cache read errors [Requests],Cache read errors [%]"
+cache_row = "1,2618880,9.99,/dev/nvme0n1p1,2,0,wt,lru,alru,4,140.5,3600,1 [h] 0 [m] 0 [s]," \
+            "normal,Running,1309440,50.0,2618,0.1,750,75.0,1000,100.0,0,0.0"
+
+core_header = "Core Id,Core Device,Exported Object,Core Size [4KiB Blocks],Core Size [GiB]," \
+              "Dirty for [s],Dirty for,Status,Seq cutoff threshold [KiB]," \
+              "Seq cutoff policy,Occupancy [4KiB blocks],Occupancy [%]," \
+              "Writes to core(s) [4KiB blocks],Writes to core(s) [%]," \
+              "Write total [Requests],Write total [%]"
+core_row = "2,/dev/sdb1,/dev/cas1-2,262144,1.00,0,0 [s],Active,1024,full,4096,1.6," \
+           "8192,100.0,12,100.0"
+
+
+def test_cache_stats_match_casadm_csv():
+    stats, percentage_stats = casadm_parser.parse_statistics([cache_header, cache_row])
+
+    assert stats == {
+        "cache id": 1,
+        "cache size": Size(2618880, Unit.Blocks4096),
+        "cache device": "/dev/nvme0n1p1",
+        "core devices": 2,
+        "inactive core devices": 0,
+        "write policy": "wt",
+        "eviction policy": "lru",
+        "cleaning policy": "alru",
+        "cache line size": Size(4, Unit.KibiByte),
+        "metadata memory footprint": Size(140.5, Unit.MebiByte),
+        "dirty for": timedelta(hours=1),
+        "metadata mode": "normal",
+        "status": "Running",
+        "occupancy": Size(1309440, Unit.Blocks4096),
+        "dirty": Size(2618, Unit.Blocks4096),
+        "read hits": 750,
+        "serviced requests": 1000,
+        "cache read errors": 0,
+    }
+    assert percentage_stats["occupancy"] == 50.0
+    assert percentage_stats["dirty"] == 0.1
+    assert percentage_stats["read hits"] == 75.0
+    # Stats without percentage value are returned in both dicts
+    assert percentage_stats["cache device"] == "/dev/nvme0n1p1"
+    assert percentage_stats["dirty for"] == timedelta(hours=1)
+
+
+def test_core_stats_match_casadm_csv():
+    stats, percentage_stats = casadm_parser.parse_statistics([core_header, core_row])
+
+    assert stats["core id"] == 2
+    assert stats["exported object"] == "/dev/cas1-2"
+    assert stats["core size"] == Size(1, Unit.GibiByte)
+    assert stats["seq cutoff threshold"] == Size(1, Unit.MebiByte)
+    assert stats["writes to core(s)"] == Size(32, Unit.MebiByte)
+    assert stats["write total"] == 12
+    assert percentage_stats["occupancy"] == 1.6
+
+
+def test_counters_are_parsed_as_raw_integers():
+    schema = casadm_parser.get_stats_schema(cache_header)
+
+    assert schema.parse_counters(cache_row.split(",")) == \
+        [2618880, 4, 140, 1309440, 2618, 750, 1000, 0]
+    assert casadm_parser.get_stats_schema(cache_header) is schema
+
+
+@pytest.mark.parametrize("name,unit", [
+    ("B", Unit.Byte), ("KB", Unit.KiloByte), ("MB", Unit.MegaByte), ("GB", Unit.GigaByte),
+    ("TB", Unit.TeraByte), ("KiB", Unit.KibiByte), ("MiB", Unit.MebiByte),
+    ("GiB", Unit.GibiByte), ("TiB", Unit.TebiByte), ("4KiB blocks", Unit.Blocks4096),
+    ("4KiB Blocks", Unit.Blocks4096), ("Blocks512", Unit.Blocks512),
+    ("GibiByte", Unit.GibiByte),
+])
+def test_parse_unit(name, unit):
+    assert parse_unit(name) == unit
+
+
+def test_parse_unit_rejects_unknown_units():
+    # Units after 'KiB' used to be parsed as 4KiB blocks and unknown ones were not reported
+    for name in ["", "kib", "4KiB", "Requests"]:
+        with pytest.raises(ValueError):
+            parse_unit(name)
+
+
+def test_parse_stats_unit():
+    assert casadm_parser.parse_stats_unit(None) == ""
+    assert casadm_parser.parse_stats_unit("s]") == "s"
+    assert casadm_parser.parse_stats_unit("%]") == "%"
+    assert casadm_parser.parse_stats_unit("Requests]") == "requests"
+    assert casadm_parser.parse_stats_unit("MiB]") == Unit.MebiByte
+
+
+def test_stats_parser_timing():
+    """Parsing time is only logged, it depends on the machine running tests."""
+    iterations = 2000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        casadm_parser.parse_statistics([cache_header, cache_row])
+    logging.getLogger(__name__).info(
+        f"Parsing {iterations} statistics rows took {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,66 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+from test_package.test_properties import TestProperties
+from test_utils.size import Size, Unit
+
+
+class DiskStats:
+    """Block layer counters of a device as reported in /proc/diskstats."""
+    __slots__ = ("reads", "reads_merged", "sectors_read", "read_time_ms",
+                 "writes", "writes_merged", "sectors_written", "write_time_ms",
+                 "ios_in_progress", "io_time_ms", "weighted_io_time_ms")
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __sub__(self, other):
+        return DiskStats(*(getattr(self, name) - getattr(other, name) for name in self.__slots__))
+
+    def __eq__(self, other):
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"DiskStats({', '.join(f'{n}={getattr(self, n)}' for n in self.__slots__)})"
+
+    def get_read_size(self):
+        return Size(self.sectors_read, Unit.Blocks512)
+
+    def get_write_size(self):
+        return Size(self.sectors_written, Unit.Blocks512)
+
+
+def parse_diskstats(output: str):
+    stats = {}
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) < 14:
+            continue
+        stats[fields[2]] = DiskStats(*(int(value) for value in fields[3:14]))
+    return stats
+
+
+def get_disk_stats(devices: list = None):
+    """
+    Returns DiskStats of given devices (paths or names, e.g. '/dev/cas1-1' or 'sdb1') read with
+    single /proc/diskstats read, as a dict keyed by device name. All devices if none given.
+    """
+    output = TestProperties.executor.execute("cat /proc/diskstats")
+    if output.exit_code != 0:
+        raise Exception(f"Failed to read disk stats. "
+                        f"stdout: {output.stdout} \n stderr :{output.stderr}")
+    stats = parse_diskstats(output.stdout)
+    if devices is None:
+        return stats
+    names = [device.replace('/dev/', '') for device in devices]
+    missing = [name for name in names if name not in stats]
+    if missing:
+        raise Exception(f"No disk stats found for {', '.join(missing)}.")
+    return {name: stats[name] for name in names}
+
+
+def get_disk_stats_delta(before: dict, after: dict):
+    return {name: after[name] - before[name] for name in after if name in before}
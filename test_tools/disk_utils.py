@@ -119,6 +119,34 @@ def create_partition(
     raise Exception(f"Could not create partition: {output.stderr}\n{output.stdout}")
 
 
+def create_partition_layout(
+        device,
+        sizes: [],
+        partition_table_type: PartitionTable = PartitionTable.msdos):
+    """
+    Creates partition table with partitions of given sizes in one sfdisk script. With msdos
+    table and more than 4 partitions, the 4th one is extended and the rest are logical.
+    Partitions are aligned to 1MiB by sfdisk.
+    """
+    TestProperties.LOGGER.info(
+        f"Creating {partition_table_type.name} partition table with {len(sizes)} partitions "
+        f"on device: {device.system_path}")
+    label = "dos" if partition_table_type == PartitionTable.msdos else "gpt"
+    lines = [f"label: {label}"]
+    for size in sizes:
+        if label == "dos" and len(sizes) > 4 and len(lines) == 4:
+            lines.append("type=5")
+        # Explicit unit, as sfdisk counts plain numbers in sectors of the device
+        lines.append(f"size={int(size.get_value()) // 1024}KiB")
+    script = "\n".join(lines)
+
+    output = TestProperties.executor.execute(
+        f"echo '{script}' | sfdisk --quiet {device.system_path} && "
+        f"partprobe {device.system_path} && udevadm settle")
+    if output.exit_code != 0:
+        raise Exception(f"Could not create partitions: {output.stderr}\n{output.stdout}")
+
+
 def get_block_size(device):
     try:
         block_size = float(TestProperties.executor.execute(
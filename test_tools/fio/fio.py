@@ -10,6 +10,7 @@ import test_tools.fs_utils
 from test_package.test_properties import TestProperties
 from test_tools import fs_utils
 from test_utils import os_utils
+from test_utils.dut_capabilities import get_capabilities
 
 
 class Fio:
@@ -32,7 +33,8 @@ class Fio:
         return self.global_cmd_parameters
 
     def is_installed(self):
-        return self.executor.execute("fio --version").stdout.strip() == self.fio_version
+        fio_version = get_capabilities(self.executor).get_fio_version()
+        return fio_version is not None and fio_version.strip() == self.fio_version
 
     def install(self):
         fio_url = f"http://brick.kernel.dk/snaps/{self.fio_version}.tar.bz2"
@@ -42,6 +44,7 @@ class Fio:
             f"cd {fio_package.parent_dir}/{self.fio_version};"
             f"./configure && make -j && make install"
         )
+        get_capabilities(self.executor).invalidate()
 
     def calculate_timeout(self):
         if self.global_cmd_parameters.get_parameter_value("time_based") is None:
@@ -66,6 +69,13 @@ class Fio:
         TestProperties.LOGGER.info(str(self))
         return self.executor.execute(str(self), timeout)
 
+    def run_in_background(self):
+        if not self.is_installed():
+            self.install()
+
+        TestProperties.LOGGER.info(str(self))
+        return self.executor.start_background_job(str(self))
+
     def execution_cmd_parameters(self):
         if len(self.jobs) > 0:
             separator = "\n\n"
@@ -4,8 +4,6 @@
 #
 
 
-import base64
-import textwrap
 from datetime import datetime
 
 from aenum import IntFlag, Enum
@@ -181,24 +179,31 @@ def read_file(file):
     return output.stdout
 
 
+def read_file_lines(file):
+    # Lines are yielded while 'cat' is running, so big files are never held in memory as a whole
+    if not file.strip():
+        raise ValueError("File path cannot be empty or whitespace.")
+    output = TestProperties.executor.execute_stream(f"cat {file}")
+    yield from output.lines()
+    if output.exit_code != 0:
+        raise Exception(f"Exception occurred while trying to read file {file}.\n"
+                        f"stderr: {output.stderr}")
+
+
 def write_file(file, content, overwrite: bool = True, unix_line_end: bool = True):
     if not file.strip():
         raise ValueError("File path cannot be empty or whitespace.")
     if not content:
         raise ValueError("Content cannot be empty.")
     if unix_line_end:
-        content.replace('\r', '')
+        content = content.replace('\r', '')
     content += '\n'
-    max_length = 60000
-    split_content = textwrap.TextWrapper(width=max_length, replace_whitespace=False).wrap(content)
-    split_content[-1] += '\n'
-    for s in split_content:
-        redirection_char = '>' if overwrite else '>>'
-        overwrite = False
-        encoded_content = base64.b64encode(s.encode("utf-8"))
-        cmd = f"printf '{encoded_content.decode('utf-8')}' " \
-            f"| base64 --decode {redirection_char} {file}"
-        TestProperties.execute_command_and_check_if_passed(cmd)
+    # Path is not expanded by shell. Executors writing directly raise OSError, reported here
+    # as Exception like failures of the command based fallback.
+    try:
+        TestProperties.executor.write_bytes(file, content.encode('utf-8'), append=not overwrite)
+    except OSError as e:
+        raise Exception(f"Failed to write file {file}.\n{e}")
 
 
 def uncompress_archive(file, destination=None):
@@ -224,6 +229,7 @@ def ls(path, options=''):
 def parse_ls_output(ls_output, dir_path=''):
     split_output = ls_output.split('\n')
     fs_items = []
+    symlinks = []
     for line in split_output:
         if not line.strip():
             continue
@@ -255,8 +261,8 @@ def parse_ls_output(ls_output, dir_path=''):
         elif file_type == 'd':
             fs_item = Directory(full_path)
         elif file_type == 'l':
-            target_path = TestProperties.executor.execute(f"readlink -f {full_path}").stdout
-            fs_item = Symlink(full_path, target_path)
+            fs_item = Symlink(full_path, None)
+            symlinks.append(fs_item)
         else:
             fs_item = FsItem(full_path)
 
@@ -272,4 +278,10 @@ def parse_ls_output(ls_output, dir_path=''):
         fs_item.size = size
         fs_item.modification_time = modification_time
         fs_items.append(fs_item)
+
+    # Resolve all symlink targets in one round trip instead of one 'readlink' per symlink
+    outputs = TestProperties.executor.execute_batch(
+        [f"readlink -f {symlink.full_path}" for symlink in symlinks])
+    for symlink, output in zip(symlinks, outputs):
+        symlink.target = output.stdout
     return fs_items
@@ -2,6 +2,7 @@
 # Copyright(c) 2019 Intel Corporation
 # SPDX-License-Identifier: BSD-3-Clause-Clear
 #
+from storage_devices.block_inventory import BlockInventory
 from storage_devices.disk import Disk, DiskType
 
 
@@ -9,11 +10,13 @@ class Dut:
     def __init__(self, dut_info):
         self.ip = dut_info['ip']
         self.disks = []
+        self.block_inventory = BlockInventory()
         for disk_info in dut_info['disks']:
             self.disks.append(Disk(disk_info['path'],
                                    DiskType[disk_info['type']],
                                    disk_info['serial'],
-                                   disk_info['blocksize']))
+                                   disk_info['blocksize'],
+                                   self.block_inventory))
 
         self.ipmi = dut_info['ipmi'] if 'ipmi' in dut_info else None
         self.spider = dut_info['spider'] if 'spider' in dut_info else None
@@ -30,6 +33,14 @@ class Dut:
         dut_str += "\n"
         return dut_str
 
+    def refresh_block_inventory(self):
+        """Reads block devices again after they were changed, e.g. partitions created."""
+        self.block_inventory.refresh()
+        for disk in self.disks:
+            disk.invalidate()
+            disk.block_info = self.block_inventory.get(disk.system_path)
+            disk.load_partitions(self.block_inventory)
+
     def get_disks_of_type(self, disk_type: DiskType):
         ret_list = []
         for d in self.disks:
@@ -0,0 +1,139 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+import json
+import os
+
+from test_package.test_properties import TestProperties
+
+# Capabilities of all DUTs are kept on the harness between test sessions
+capabilities_file = os.path.join(os.path.expanduser("~"), ".cache", "test_framework",
+                                 "dut_capabilities.json")
+
+# Values identifying the state of the DUT; capabilities are probed again when any changes
+validation_commands = {
+    "boot_id": "cat /proc/sys/kernel/random/boot_id",
+    "fingerprint": "for tool in casadm fio; do path=$(command -v $tool) && "
+                   "stat -c '%n %Y %s' $path; done; "
+                   "modinfo -F srcversion cas_cache 2>/dev/null; true",
+}
+
+probe_commands = {
+    "kernel_version": "uname -r",
+    "casadm_path": "command -v casadm",
+    "casadm_version": "casadm -V -o csv",
+    "fio_version": "fio --version",
+    "fio_engines": "fio --enghelp",
+    "cpu_count": "nproc",
+    "numa_nodes": "ls -d /sys/devices/system/node/node[0-9]*",
+}
+
+__capabilities = {}
+
+
+def get_capabilities(executor=None):
+    """Returns DutCapabilities of the DUT of given executor (TestProperties.executor default)."""
+    executor = executor if executor is not None else TestProperties.executor
+    dut_key = getattr(executor, "ip", "localhost")
+    if dut_key not in __capabilities:
+        __capabilities[dut_key] = DutCapabilities(dut_key, load_capabilities().get(dut_key))
+    capabilities = __capabilities[dut_key]
+    capabilities.executor = executor
+    return capabilities
+
+
+def load_capabilities():
+    try:
+        with open(capabilities_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_capabilities(dut_key, values):
+    stored = load_capabilities()
+    stored[dut_key] = values
+    os.makedirs(os.path.dirname(capabilities_file), exist_ok=True)
+    with open(capabilities_file, 'w') as f:
+        json.dump(stored, f, indent=2)
+
+
+class DutCapabilities:
+    """
+    Facts about the DUT which do not change within a boot: kernel, CAS and fio versions,
+    CPU and NUMA layout, fio engines. They are validated once per executor with single
+    command batch (boot id and fingerprint of installed tools) and probed again only if the
+    DUT was rebooted or tools were reinstalled. Installers should call invalidate().
+    """
+    def __init__(self, dut_key, values: dict = None):
+        self.dut_key = dut_key
+        self.executor = None
+        self.values = values or {}
+        self.__validated_executor = None
+
+    def invalidate(self):
+        self.values = {}
+        self.__validated_executor = None
+
+    def get(self, name):
+        self.__validate()
+        return self.values[name]
+
+    def get_kernel_version(self):
+        return self.get("kernel_version")
+
+    def is_casadm_installed(self):
+        return self.get("casadm_path") is not None
+
+    def get_casadm_version(self):
+        """Returns version string printed by casadm or None if casadm is not installed."""
+        return self.get("casadm_version")
+
+    def get_fio_version(self):
+        return self.get("fio_version")
+
+    def get_fio_engines(self):
+        return self.get("fio_engines")
+
+    def get_cpu_count(self):
+        return self.get("cpu_count")
+
+    def get_numa_nodes(self):
+        return self.get("numa_nodes")
+
+    def __validate(self):
+        if self.values and self.__validated_executor is self.executor:
+            return
+        outputs = self.executor.execute_batch(list(validation_commands.values()))
+        current = {name: output.stdout for name, output in zip(validation_commands, outputs)}
+        if any(self.values.get(name) != value for name, value in current.items()):
+            TestProperties.LOGGER.info(f"Probing capabilities of DUT {self.dut_key}.")
+            self.values = current
+            self.values.update(self.__probe())
+            save_capabilities(self.dut_key, self.values)
+        self.__validated_executor = self.executor
+
+    def __probe(self):
+        outputs = dict(zip(probe_commands,
+                           self.executor.execute_batch(list(probe_commands.values()))))
+
+        def stdout(name):
+            return outputs[name].stdout if outputs[name].exit_code == 0 else None
+
+        casadm_version = stdout("casadm_version")
+        fio_engines = stdout("fio_engines")
+        numa_nodes = stdout("numa_nodes")
+        return {
+            "kernel_version": stdout("kernel_version"),
+            "casadm_path": stdout("casadm_path"),
+            "casadm_version": casadm_version.splitlines()[1].split(',')[-1]
+            if casadm_version else None,
+            "fio_version": stdout("fio_version"),
+            "fio_engines": [line.strip() for line in fio_engines.splitlines()[1:]]
+            if fio_engines else [],
+            "cpu_count": int(stdout("cpu_count")),
+            "numa_nodes": [int(node.rsplit("node", 1)[1]) for node in numa_nodes.split()]
+            if numa_nodes else [],
+        }
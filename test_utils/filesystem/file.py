@@ -30,6 +30,9 @@ class File(FsItem):
     def read(self):
         return fs_utils.read_file(str(self))
 
+    def read_lines(self):
+        return fs_utils.read_file_lines(str(self))
+
     def write(self, content, overwrite: bool = True):
         fs_utils.write_file(str(self), content, overwrite)
         self.refresh_item()
@@ -23,6 +23,9 @@ class LinuxCommand:
     def run_in_background(self):
         return self.command_executor.execute_in_background(str(self))
 
+    def start_background_job(self):
+        return self.command_executor.start_background_job(str(self))
+
     def set_flags(self, *flag):
         for f in flag:
             self.command_flags.append(f)
@@ -3,6 +3,8 @@
 # SPDX-License-Identifier: BSD-3-Clause-Clear
 #
 
+import codecs
+
 
 class Output:
     def __init__(self, output_out, output_err, return_code):
@@ -11,3 +13,35 @@ class Output:
         self.stderr = output_err.decode('utf-8').rstrip() if type(output_err) == bytes else \
             output_err
         self.exit_code = return_code
+
+
+class StreamOutput:
+    """
+    Output of a command consumed while the command is running. Stdout is available once,
+    either as raw byte chunks or as decoded lines. Stderr and exit code are set after the
+    stream is exhausted.
+    """
+    def __init__(self, chunk_source):
+        # chunk_source is a generator yielding stdout chunks and returning
+        # (stderr, exit_code) when the command finishes
+        self.__chunk_source = chunk_source
+        self.stderr = None
+        self.exit_code = None
+
+    def __iter__(self):
+        return self.lines()
+
+    def chunks(self):
+        stderr, self.exit_code = yield from self.__chunk_source
+        self.stderr = stderr.decode('utf-8').rstrip() if isinstance(stderr, bytes) else stderr
+
+    def lines(self):
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        remainder = ''
+        for chunk in self.chunks():
+            lines = (remainder + decoder.decode(chunk)).split('\n')
+            remainder = lines.pop()
+            yield from lines
+        remainder += decoder.decode(b'', final=True)
+        if remainder:
+            yield remainder
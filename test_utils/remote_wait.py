@@ -0,0 +1,71 @@
+#
+# Copyright(c) 2019 Intel Corporation
+# SPDX-License-Identifier: BSD-3-Clause-Clear
+#
+
+from datetime import timedelta
+
+from test_package.test_properties import TestProperties
+from test_utils.size import Size, Unit
+
+
+class WaitResult:
+    """
+    Result of a wait executed on the DUT. True if the condition was met; elapsed is measured
+    on the DUT from the start of the wait until the condition was met (or the timeout).
+    value is the output of the last condition check.
+    """
+    def __init__(self, met: bool, elapsed: timedelta, value: str):
+        self.met = met
+        self.elapsed = elapsed
+        self.value = value
+
+    def __bool__(self):
+        return self.met
+
+    def __repr__(self):
+        return f"WaitResult(met={self.met}, elapsed={self.elapsed}, value={self.value!r})"
+
+
+def wait_for_command(condition_cmd: str, timeout: timedelta,
+                     interval: timedelta = timedelta(milliseconds=100)):
+    """
+    Runs condition_cmd on the DUT every interval until it exits with 0 or timeout expires.
+    The whole loop is executed as single command, so it costs one round trip.
+    """
+    script = f"start=$(date +%s%N)\n" \
+        f"deadline=$((start + {int(timeout.total_seconds() * 1e9)}))\n" \
+        f"while true; do\n" \
+        f"value=$({condition_cmd})\n" \
+        f"rc=$?\n" \
+        f"now=$(date +%s%N)\n" \
+        f"if [ $rc -eq 0 ]; then echo \"met $((now - start)) $value\"; exit 0; fi\n" \
+        f"if [ $now -ge $deadline ]; then echo \"timeout $((now - start)) $value\"; exit 0; fi\n" \
+        f"sleep {interval.total_seconds()}\n" \
+        f"done"
+    output = TestProperties.executor.execute(script, timeout + timedelta(minutes=1))
+    state, _, rest = output.stdout.partition(" ")
+    if output.exit_code != 0 or state not in ["met", "timeout"]:
+        raise Exception(f"Failed to wait for '{condition_cmd}'. "
+                        f"stdout: {output.stdout} \n stderr :{output.stderr}")
+    elapsed, _, value = rest.partition(" ")
+    return WaitResult(state == "met", timedelta(microseconds=int(elapsed) // 1000), value)
+
+
+def wait_for_device(path: str, timeout: timedelta,
+                    interval: timedelta = timedelta(milliseconds=100)):
+    """Waits until block device node appears."""
+    return wait_for_command(f"test -b {path}", timeout, interval)
+
+
+def wait_for_path_removed(path: str, timeout: timedelta,
+                          interval: timedelta = timedelta(milliseconds=100)):
+    return wait_for_command(f"test ! -e {path}", timeout, interval)
+
+
+def wait_for_file_size(path: str, size: Size, timeout: timedelta,
+                       interval: timedelta = timedelta(milliseconds=100)):
+    """Waits until file is at least of given size. Result value is the last file size."""
+    return wait_for_command(f"size=$(stat -c %s {path} 2>/dev/null) && echo $size "
+                            f"&& [ $size -ge {int(size.get_value(Unit.Byte))} ]",
+                            timeout, interval)
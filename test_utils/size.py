@@ -9,33 +9,10 @@ from multimethod import multimethod
 
 
 def parse_unit(str_unit: str):
-    for u in Unit:
-        if str_unit == u.name:
-            return u
-
-    if str_unit == "KiB":
-        return Unit.KibiByte
-    elif str_unit == "4KiB blocks" or "4KiB Blocks":
-        return Unit.Blocks4096
-    elif str_unit == "MiB":
-        return Unit.MebiByte
-    elif str_unit == "GiB":
-        return Unit.GibiByte
-    elif str_unit == "TiB":
-        return Unit.TebiByte
-
-    if str_unit == "B":
-        return Unit.Byte
-    elif str_unit == "KB":
-        return Unit.KiloByte
-    elif str_unit == "MB":
-        return Unit.MegaByte
-    elif str_unit == "GB":
-        return Unit.GigaByte
-    elif str_unit == "TB":
-        return Unit.TeraByte
-
-    raise ValueError(f"Unable to parse {str_unit}")
+    unit = unit_names.get(str_unit)
+    if unit is None:
+        raise ValueError(f"Unable to parse {str_unit}")
+    return unit
 
 
 class Unit(enum.Enum):
@@ -52,6 +29,23 @@ class Unit(enum.Enum):
     Blocks4096 = 4096
 
 
+# Unit names accepted by parse_unit(): enum member names and abbreviations printed by tools
+unit_names = {
+    **Unit.__members__,
+    "B": Unit.Byte,
+    "KB": Unit.KiloByte,
+    "MB": Unit.MegaByte,
+    "GB": Unit.GigaByte,
+    "TB": Unit.TeraByte,
+    "KiB": Unit.KibiByte,
+    "MiB": Unit.MebiByte,
+    "GiB": Unit.GibiByte,
+    "TiB": Unit.TebiByte,
+    "4KiB blocks": Unit.Blocks4096,
+    "4KiB Blocks": Unit.Blocks4096,
+}
+
+
 class Size:
     def __init__(self, value: float, unit: Unit = Unit.Byte):
         if value < 0: